@@ -0,0 +1,76 @@
+"""
+Bloom Filter
+Compact probabilistic set of string IDs, persisted as a raw bit array for instant reloads
+"""
+
+import hashlib
+import math
+from pathlib import Path
+from typing import Iterable, Union
+
+import numpy as np
+
+_BIT_MASKS = np.array([1 << bit for bit in range(8)], dtype=np.uint8)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys backed by a numpy bit array
+
+    Membership tests never give false negatives; false positives occur at
+    roughly error_rate once capacity keys have been added. The k probe
+    positions come from one BLAKE2b digest via Kirsch-Mitzenmacher double
+    hashing (h1 + i * h2), so a lookup costs a single hash call.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 1e-6):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate in (0, 1)")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self._probe_steps = np.arange(self.num_hashes, dtype=np.uint64)
+
+    def _probe(self, key: str):
+        """Byte offsets and bit masks probed for a key"""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little") % self.num_bits
+        h2 = int.from_bytes(digest[8:], "little") % self.num_bits or 1
+        positions = (np.uint64(h1) + self._probe_steps * np.uint64(h2)) % np.uint64(self.num_bits)
+        return positions >> np.uint64(3), _BIT_MASKS[positions & np.uint64(7)]
+
+    def add(self, key: str):
+        """Insert a key"""
+        offsets, masks = self._probe(key)
+        np.bitwise_or.at(self._bits, offsets, masks)
+
+    def update(self, keys: Iterable[str]):
+        """Insert every key from an iterable"""
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        offsets, masks = self._probe(key)
+        return bool(np.all(self._bits[offsets] & masks))
+
+    def save(self, path: Union[str, Path]):
+        """Write the raw bit array to disk"""
+        self._bits.tofile(str(path))
+
+    @classmethod
+    def load(cls, path: Union[str, Path], capacity: int = 100_000, error_rate: float = 1e-6) -> "BloomFilter":
+        """Load a saved bit array, or return an empty filter if none matches these parameters"""
+        bloom = cls(capacity, error_rate)
+        path = Path(path)
+        if path.exists():
+            bits = np.fromfile(str(path), dtype=np.uint8)
+            if bits.size == bloom._bits.size:
+                bloom._bits = bits
+        return bloom
+
+    @property
+    def is_empty(self) -> bool:
+        """True when no key has been added"""
+        return not self._bits.any()
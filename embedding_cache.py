@@ -0,0 +1,103 @@
+"""
+Embedding Cache
+Disk-backed float16 embedding store keyed by embedding source and content hash, so unchanged texts are never re-embedded
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class EmbeddingCache:
+    """Append-only embedding store backed by a memory-mapped float16 matrix
+
+    Vectors live one per row in a raw float16 file, halving disk use versus
+    float32; a JSON sidecar maps each key to its row. Lookups upcast the row
+    back to float32. Call save() to persist the key index.
+    """
+
+    VECTORS_FILE = "embeddings_f16.bin"
+    INDEX_FILE = "embeddings_index.json"
+
+    def __init__(self, directory: Union[str, Path], dimension: int = 768, initial_rows: int = 1024):
+        self.directory = Path(directory)
+        self.dimension = dimension
+        self.initial_rows = initial_rows
+        self._vectors: Optional[np.memmap] = None
+        self._dirty = False
+
+        try:
+            with open(self.directory / self.INDEX_FILE, "rb") as f:
+                data = f.read()
+            self._rows: Dict[str, int] = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+        except (OSError, ValueError):
+            self._rows = {}
+
+        vectors_path = self.directory / self.VECTORS_FILE
+        if self._rows and vectors_path.exists():
+            capacity = vectors_path.stat().st_size // (2 * dimension)
+            if capacity >= len(self._rows):
+                self._vectors = np.memmap(vectors_path, dtype=np.float16, mode="r+", shape=(capacity, dimension))
+        if self._vectors is None:
+            self._rows = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Cached vector for a key as float32, or None"""
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        return self._vectors[row].astype(np.float32)
+
+    def put(self, key: str, vector: np.ndarray):
+        """Store a vector under a key; existing keys are left untouched"""
+        if key in self._rows:
+            return
+
+        row = len(self._rows)
+        self._ensure_capacity(row + 1)
+        self._vectors[row] = vector
+        self._rows[key] = row
+        self._dirty = True
+
+    def save(self):
+        """Flush vectors and write the key index"""
+        if not self._dirty:
+            return
+
+        self._vectors.flush()
+        with open(self.directory / self.INDEX_FILE, "wb") as f:
+            f.write(orjson.dumps(self._rows) if ORJSON_AVAILABLE else json.dumps(self._rows).encode("utf-8"))
+        self._dirty = False
+
+    def _ensure_capacity(self, rows: int):
+        """Grow the backing file (doubling) until it holds at least `rows` vectors"""
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if rows <= capacity:
+            return
+
+        new_capacity = max(self.initial_rows, capacity)
+        while new_capacity < rows:
+            new_capacity *= 2
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        vectors_path = self.directory / self.VECTORS_FILE
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        with open(vectors_path, "ab") as f:
+            f.truncate(new_capacity * self.dimension * 2)
+        self._vectors = np.memmap(vectors_path, dtype=np.float16, mode="r+", shape=(new_capacity, self.dimension))
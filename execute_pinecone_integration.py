@@ -124,6 +124,7 @@ class PineconeIntegrationExecutor:
             
             # Verify ingestion
             count = await ingestion.verify_ingestion()
+            await ingestion.shutdown()
             
             if count > 0:
                 logger.info(f"✅ Successfully ingested {count} protocols to Pinecone")
@@ -0,0 +1,134 @@
+"""
+Keyword Automaton
+Multi-keyword matcher that reports every keyword occurrence in a single pass over the text
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+def _trie_regex(node: Dict) -> str:
+    """Render a character trie as a regex alternation with shared prefixes"""
+    branches = []
+    leaf_chars = []
+    for char, child in sorted(node.items()):
+        if not char:
+            continue
+        if list(child) == [""]:
+            # Keyword ends right after this character: fold into a character class
+            leaf_chars.append(re.escape(char))
+        else:
+            branches.append(re.escape(char) + _trie_regex(child))
+
+    if len(leaf_chars) == 1:
+        branches.append(leaf_chars[0])
+    elif leaf_chars:
+        branches.append("[" + "".join(leaf_chars) + "]")
+
+    if not branches:
+        return ""
+
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # Greedy optional tail: prefer the longest keyword ending below this node
+        return f"(?:{body})?"
+    return body
+
+
+class KeywordAutomaton:
+    """Aho-Corasick style keyword matcher backed by a trie-compressed regex
+
+    Mirrors the pyahocorasick interface (add_word / make_automaton / iter) so
+    keywords can be tagged with payloads and all hits, including overlapping
+    ones such as "phase i" inside "phase iii", come out of one C-level scan.
+
+    With ignore_case=True keywords match case-insensitively on the original
+    text, so callers need no lowercased copy and positions index the input.
+    """
+
+    def __init__(self, ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        self._payloads: Dict[str, List[Any]] = {}
+        self._hits: Dict[str, List[Tuple[int, Any]]] = {}
+        self._pattern = None
+        self._longest_pattern = None
+
+    def add_word(self, keyword: str, payload: Any):
+        """Register a keyword; a keyword added more than once reports every payload"""
+        if not keyword:
+            raise ValueError("Keyword must be a non-empty string")
+
+        if self.ignore_case:
+            keyword = keyword.lower()
+        self._payloads.setdefault(keyword, []).append(payload)
+        self._pattern = None
+
+    def make_automaton(self):
+        """Compile the registered keywords into a single matcher"""
+        trie = {}
+        for keyword in self._payloads:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        # Every keyword matching at a position is a prefix of the longest
+        # keyword matching there, so hits are precomputed per longest match
+        self._hits = {
+            keyword: [
+                (len(prefix) - 1, payload)
+                for prefix in sorted(self._payloads, key=len)
+                if keyword.startswith(prefix)
+                for payload in self._payloads[prefix]
+            ]
+            for keyword in self._payloads
+        }
+        flags = re.IGNORECASE if self.ignore_case else 0
+        trie_regex = _trie_regex(trie)
+        self._pattern = re.compile(f"(?=({trie_regex}))", flags)
+        self._longest_pattern = re.compile(trie_regex, flags)
+
+    def iter(self, text: str) -> Iterator[Tuple[int, Any]]:
+        """Yield (end_index, payload) for every keyword occurrence, ordered by start position"""
+        if self._pattern is None:
+            raise RuntimeError("make_automaton() must be called before iter()")
+        if not self._payloads:
+            return
+
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            for offset, payload in self._lookup(match.group(1), self._hits):
+                yield start + offset, payload
+
+    def iter_longest(self, text: str) -> Iterator[Tuple[int, Any]]:
+        """Yield (end_index, payload) for leftmost-longest, non-overlapping keyword occurrences
+
+        Keywords contained in a longer match (e.g. "daily" inside "twice daily")
+        are not reported for that span.
+        """
+        if self._pattern is None:
+            raise RuntimeError("make_automaton() must be called before iter_longest()")
+        if not self._payloads:
+            return
+
+        for match in self._longest_pattern.finditer(text):
+            end_index = match.end() - 1
+            for payload in self._lookup(match.group(), self._payloads):
+                yield end_index, payload
+
+    def _lookup(self, matched: str, table: Dict[str, List[Any]]) -> List[Any]:
+        """Entries of a keyword-keyed table for the keyword matched at a position"""
+        if not self.ignore_case:
+            return table[matched]
+
+        entries = table.get(matched.lower())
+        if entries is None:
+            # Unicode case folding can match characters whose lower() differs
+            # from the keyword (e.g. the Kelvin sign or dotted capital I)
+            for keyword in table:
+                if len(keyword) == len(matched) and re.fullmatch(re.escape(keyword), matched, re.IGNORECASE):
+                    return table[keyword]
+        return entries
+
+    def __len__(self) -> int:
+        return len(self._payloads)
@@ -5,18 +5,156 @@ Processes 16,730 real anonymized protocols to extract training data for robust M
 
 import os
 import re
+import sys
 import json
+import random
 import logging
 import asyncio
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, NamedTuple, Tuple, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
+from functools import lru_cache
 import glob
+from collections import Counter
 from pathlib import Path
 
+from keyword_automaton import KeywordAutomaton
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Single pass over the text for all supported date layouts; the matching
+# branch name selects the strptime format(s) to try
+_DATE_RE = re.compile(
+    r"(?P<dmy_name>\d{1,2}\s+\w+\s+\d{4})"  # 17 Oct 2018
+    r"|(?P<dmy_num>\d{1,2}[/-]\d{1,2}[/-]\d{4})"  # 17/10/2018
+    r"|(?P<mdy_name>\w+\s+\d{1,2},?\s+\d{4})"  # October 17, 2018
+)
+
+_DATE_FORMATS = {
+    "dmy_name": ("%d %b %Y",),
+    "dmy_num": ("%d/%m/%Y", "%m/%d/%Y"),
+    "mdy_name": ("%B %d, %Y", "%b %d, %Y"),
+}
+
+# Union pattern reports which class matched, so one scan replaces the
+# per-term substring checks
+_STATUS_RE = re.compile(
+    r"(?P<completed>completed|finished|concluded)"
+    r"|(?P<ongoing>ongoing|recruiting|active)"
+    r"|(?P<terminated>terminated|discontinued|suspended)",
+    re.IGNORECASE
+)
+
+# Matched case-insensitively on the original content, which keeps the
+# endpoint text readable and avoids lowercasing the whole document
+_ENDPOINT_RES = {
+    endpoint_type: re.compile(rf"{endpoint_type}\s+endpoint[s]?:\s*([^.]{{10,200}})", re.IGNORECASE)
+    for endpoint_type in ("primary", "secondary", "exploratory")
+}
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_text: str, layout: str) -> Optional[datetime]:
+    """Parse a matched date string using only the formats for its layout"""
+    for fmt in _DATE_FORMATS[layout]:
+        try:
+            return datetime.strptime(date_text, fmt)
+        except ValueError:
+            continue
+    return None
+
+# Classification patterns
+PHASE_INDICATORS = {
+    "Phase I": [
+        "phase i", "phase 1", "first in human", "dose escalation", "maximum tolerated dose",
+        "mtd", "dose limiting toxicity", "dlt", "safety run-in", "dose finding"
+    ],
+    "Phase II": [
+        "phase ii", "phase 2", "efficacy", "response rate", "objective response",
+        "progression free survival", "preliminary efficacy", "proof of concept"
+    ],
+    "Phase III": [
+        "phase iii", "phase 3", "pivotal", "registration", "confirmatory",
+        "superiority", "non-inferiority", "overall survival", "randomized controlled"
+    ],
+    "Phase IV": [
+        "phase iv", "phase 4", "post-marketing", "real world", "observational",
+        "registry", "post-approval", "pharmacovigilance"
+    ]
+}
+
+THERAPEUTIC_INDICATORS = {
+    "oncology": [
+        "cancer", "tumor", "oncology", "carcinoma", "lymphoma", "melanoma", "sarcoma",
+        "metastatic", "malignant", "neoplasm", "chemotherapy", "targeted therapy",
+        "immunotherapy", "solid tumor", "hematologic", "leukemia"
+    ],
+    "neurology": [
+        "neurological", "alzheimer", "parkinson", "multiple sclerosis", "epilepsy",
+        "stroke", "dementia", "cognitive", "neurodegeneration", "brain", "cns"
+    ],
+    "cardiology": [
+        "cardiac", "cardiovascular", "heart", "myocardial", "coronary", "hypertension",
+        "heart failure", "arrhythmia", "atherosclerosis", "vascular"
+    ],
+    "diabetes": [
+        "diabetes", "diabetic", "glucose", "insulin", "glycemic", "hba1c",
+        "type 1 diabetes", "type 2 diabetes", "metabolic"
+    ],
+    "immunology": [
+        "autoimmune", "rheumatoid arthritis", "lupus", "inflammatory bowel",
+        "crohn", "psoriasis", "immune", "immunosuppressive"
+    ],
+    "infectious_disease": [
+        "infection", "infectious", "antimicrobial", "antibiotic", "antiviral",
+        "hepatitis", "hiv", "tuberculosis", "bacterial", "viral"
+    ],
+    "respiratory": [
+        "asthma", "copd", "pulmonary", "respiratory", "lung", "bronchial",
+        "cystic fibrosis", "pneumonia", "pulmonary fibrosis"
+    ]
+}
+
+OUTCOME_TERMS = {
+    "success": ["completed", "successful", "approved", "positive results", "met endpoint"],
+    "failure": ["terminated", "failed", "discontinued", "negative results", "futility"]
+}
+
+# Sponsor names recognised in free text when no sponsor label is present
+PHARMA_SPONSORS = ["Bayer", "Novartis", "Pfizer", "Roche", "GSK", "Merck", "AstraZeneca", "BMS", "J&J", "Sanofi"]
+
+def _build_keyword_automaton() -> KeywordAutomaton:
+    """Build the combined phase/therapeutic/outcome/sponsor keyword automaton"""
+    automaton = KeywordAutomaton()
+    
+    for phase, indicators in PHASE_INDICATORS.items():
+        for indicator in indicators:
+            automaton.add_word(indicator, ("phase", phase))
+    
+    for area, indicators in THERAPEUTIC_INDICATORS.items():
+        for indicator in indicators:
+            automaton.add_word(indicator, ("area", area))
+    
+    for kind, terms in OUTCOME_TERMS.items():
+        for term in terms:
+            automaton.add_word(term, (kind, term))
+    
+    for sponsor in PHARMA_SPONSORS:
+        automaton.add_word(sponsor.lower(), ("sponsor", sponsor))
+    
+    automaton.make_automaton()
+    return automaton
+
+# Built once at import and shared by every analyzer instance (and by forked
+# workers via copy-on-write) instead of being rebuilt per instance
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+class Amendment(NamedTuple):
+    """Single entry in a protocol's amendment history"""
+    number: str
+    description: str
+    type: str
+
+@dataclass(slots=True)
 class ProtocolMetadata:
     """Extracted metadata from real protocol files"""
     protocol_id: str
@@ -36,7 +174,7 @@ class ProtocolMetadata:
     # Amendment data
     version: str
     amendment_count: int
-    amendment_history: List[Dict]
+    amendment_history: List[Amendment]
     
     # Success indicators
     success_score: float
@@ -64,71 +202,30 @@ class ProtocolDataAnalyzer:
         self.sample_size = 2000  # Sample for initial analysis (can be increased)
         
         # Classification patterns
-        self.phase_indicators = {
-            "Phase I": [
-                "phase i", "phase 1", "first in human", "dose escalation", "maximum tolerated dose",
-                "mtd", "dose limiting toxicity", "dlt", "safety run-in", "dose finding"
-            ],
-            "Phase II": [
-                "phase ii", "phase 2", "efficacy", "response rate", "objective response",
-                "progression free survival", "preliminary efficacy", "proof of concept"
-            ],
-            "Phase III": [
-                "phase iii", "phase 3", "pivotal", "registration", "confirmatory",
-                "superiority", "non-inferiority", "overall survival", "randomized controlled"
-            ],
-            "Phase IV": [
-                "phase iv", "phase 4", "post-marketing", "real world", "observational",
-                "registry", "post-approval", "pharmacovigilance"
-            ]
-        }
+        self.phase_indicators = PHASE_INDICATORS
+        self.therapeutic_indicators = THERAPEUTIC_INDICATORS
+        self.outcome_terms = OUTCOME_TERMS
         
-        self.therapeutic_indicators = {
-            "oncology": [
-                "cancer", "tumor", "oncology", "carcinoma", "lymphoma", "melanoma", "sarcoma",
-                "metastatic", "malignant", "neoplasm", "chemotherapy", "targeted therapy",
-                "immunotherapy", "solid tumor", "hematologic", "leukemia"
-            ],
-            "neurology": [
-                "neurological", "alzheimer", "parkinson", "multiple sclerosis", "epilepsy",
-                "stroke", "dementia", "cognitive", "neurodegeneration", "brain", "cns"
-            ],
-            "cardiology": [
-                "cardiac", "cardiovascular", "heart", "myocardial", "coronary", "hypertension",
-                "heart failure", "arrhythmia", "atherosclerosis", "vascular"
-            ],
-            "diabetes": [
-                "diabetes", "diabetic", "glucose", "insulin", "glycemic", "hba1c",
-                "type 1 diabetes", "type 2 diabetes", "metabolic"
-            ],
-            "immunology": [
-                "autoimmune", "rheumatoid arthritis", "lupus", "inflammatory bowel",
-                "crohn", "psoriasis", "immune", "immunosuppressive"
-            ],
-            "infectious_disease": [
-                "infection", "infectious", "antimicrobial", "antibiotic", "antiviral",
-                "hepatitis", "hiv", "tuberculosis", "bacterial", "viral"
-            ],
-            "respiratory": [
-                "asthma", "copd", "pulmonary", "respiratory", "lung", "bronchial",
-                "cystic fibrosis", "pneumonia", "pulmonary fibrosis"
-            ]
-        }
+        # Every classification/outcome keyword tagged with its kind, scanned once per protocol
+        self.keyword_automaton = _KEYWORD_AUTOMATON
+    
+    def _scan_keywords(self, content: str) -> Dict[str, Counter]:
+        """Count all tagged keywords in a single pass over the content"""
+        counts = {"phase": Counter(), "area": Counter(), "success": Counter(), "failure": Counter(), "sponsor": Counter()}
+        for _, (kind, name) in self.keyword_automaton.iter(content.lower()):
+            counts[kind][name] += 1
+        return counts
     
     async def analyze_all_protocols(self, sample_size: Optional[int] = None):
         """Analyze protocols from 16,730 real anonymized protocol files"""
         logger.info(f"🔍 Analyzing protocols in {self.data_path}")
         
-        protocol_files = list(self.data_path.glob("protocol_*.txt"))
-        total_files = len(protocol_files)
-        logger.info(f"Found {total_files} protocol files (16,730 real anonymized protocols)")
-        
         # Use sample size if specified, otherwise use configured sample size
         analysis_size = sample_size or self.sample_size
+        protocol_files, total_files = self._sample_protocol_files(analysis_size)
+        logger.info(f"Found {total_files} protocol files (16,730 real anonymized protocols)")
+        
         if analysis_size < total_files:
-            # Sample randomly for representative analysis
-            import random
-            protocol_files = random.sample(protocol_files, analysis_size)
             logger.info(f"Analyzing random sample of {analysis_size} protocols for efficiency")
         
         # Process in batches to manage memory
@@ -163,6 +260,29 @@ class ProtocolDataAnalyzer:
         
         return self.protocols
     
+    def _sample_protocol_files(self, sample_size: int) -> Tuple[List[Path], int]:
+        """Randomly sample protocol files in one directory pass (reservoir sampling)"""
+        if not self.data_path.is_dir():
+            return [], 0
+        
+        reservoir = []
+        total_files = 0
+        
+        with os.scandir(self.data_path) as entries:
+            for entry in entries:
+                if not (entry.name.startswith("protocol_") and entry.name.endswith(".txt")):
+                    continue
+                
+                total_files += 1
+                if len(reservoir) < sample_size:
+                    reservoir.append(entry.path)
+                else:
+                    slot = random.randrange(total_files)
+                    if slot < sample_size:
+                        reservoir[slot] = entry.path
+        
+        return [Path(path) for path in reservoir], total_files
+    
     async def _analyze_single_protocol(self, file_path: Path) -> Optional[ProtocolMetadata]:
         """Analyze a single protocol file"""
         try:
@@ -176,17 +296,20 @@ class ProtocolDataAnalyzer:
             protocol_id = file_path.stem
             title = self._extract_title(content)
             
+            # Phase, therapeutic area and outcome keywords in one scan
+            keyword_counts = self._scan_keywords(content)
+            
             # Extract phase
-            phase = self._classify_phase(content)
+            phase = self._classify_phase(keyword_counts["phase"])
             
             # Extract therapeutic area
-            therapeutic_area = self._classify_therapeutic_area(content)
+            therapeutic_area = self._classify_therapeutic_area(keyword_counts["area"])
             
             # Extract compound/drug info
             compound_name = self._extract_compound_name(content)
             indication = self._extract_indication(content)
             study_type = self._extract_study_type(content)
-            sponsor = self._extract_sponsor(content)
+            sponsor = self._extract_sponsor(content, keyword_counts["sponsor"])
             
             # Extract timeline data
             dates = self._extract_dates(content)
@@ -202,13 +325,19 @@ class ProtocolDataAnalyzer:
             amendment_count = len(amendment_history)
             
             # Calculate success score
-            success_score = self._calculate_success_score(content, amendment_count, development_duration)
+            success_score = self._calculate_success_score(keyword_counts, amendment_count, development_duration)
             completion_status = self._determine_completion_status(content)
             
             # Extract text characteristics
             sections = self._extract_sections(content)
             endpoint_types = self._extract_endpoint_types(content)
             
+            # Categorical fields repeat across thousands of protocols; share one object per value
+            phase = sys.intern(phase)
+            therapeutic_area = sys.intern(therapeutic_area)
+            study_type = sys.intern(study_type)
+            completion_status = sys.intern(completion_status)
+            
             return ProtocolMetadata(
                 protocol_id=protocol_id,
                 title=title,
@@ -251,15 +380,10 @@ class ProtocolDataAnalyzer:
         
         return "Unknown Title"
     
-    def _classify_phase(self, content: str) -> str:
+    def _classify_phase(self, phase_counts: Counter) -> str:
         """Classify study phase"""
-        content_lower = content.lower()
-        
-        # Count indicators for each phase
-        phase_scores = {}
-        for phase, indicators in self.phase_indicators.items():
-            score = sum(content_lower.count(indicator) for indicator in indicators)
-            phase_scores[phase] = score
+        # Indicator counts for each phase
+        phase_scores = {phase: phase_counts[phase] for phase in self.phase_indicators}
         
         # Return phase with highest score
         if phase_scores:
@@ -269,15 +393,10 @@ class ProtocolDataAnalyzer:
         
         return "Unknown Phase"
     
-    def _classify_therapeutic_area(self, content: str) -> str:
+    def _classify_therapeutic_area(self, area_counts: Counter) -> str:
         """Classify therapeutic area"""
-        content_lower = content.lower()
-        
-        # Count indicators for each area
-        area_scores = {}
-        for area, indicators in self.therapeutic_indicators.items():
-            score = sum(content_lower.count(indicator) for indicator in indicators)
-            area_scores[area] = score
+        # Indicator counts for each area
+        area_scores = {area: area_counts[area] for area in self.therapeutic_indicators}
         
         # Return area with highest score
         if area_scores:
@@ -345,7 +464,7 @@ class ProtocolDataAnalyzer:
         
         return "Unknown Design"
     
-    def _extract_sponsor(self, content: str) -> str:
+    def _extract_sponsor(self, content: str, sponsor_counts: Counter) -> str:
         """Extract sponsor information"""
         patterns = [
             r"Sponsor:\s*([^\n]+)",
@@ -360,15 +479,10 @@ class ProtocolDataAnalyzer:
                 if len(sponsor) > 2:
                     return sponsor
         
-        # Look for pharmaceutical company patterns in text
-        pharma_patterns = [
-            r"(Bayer|Novartis|Pfizer|Roche|GSK|Merck|AstraZeneca|BMS|J&J|Sanofi)"
-        ]
-        
-        for pattern in pharma_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                return match.group(1)
+        # Fall back to pharmaceutical company names from the keyword scan;
+        # counters keep insertion order, so the first key is the earliest mention
+        for sponsor in sponsor_counts:
+            return sponsor
         
         return "Unknown Sponsor"
     
@@ -376,28 +490,11 @@ class ProtocolDataAnalyzer:
         """Extract relevant dates"""
         dates = {"original": None, "current": None}
         
-        # Look for date patterns
-        date_patterns = [
-            r"(\d{1,2}\s+\w+\s+\d{4})",  # 17 Oct 2018
-            r"(\d{1,2}[/-]\d{1,2}[/-]\d{4})",  # 17/10/2018
-            r"(\w+\s+\d{1,2},?\s+\d{4})"  # October 17, 2018
-        ]
-        
         found_dates = []
-        for pattern in date_patterns:
-            matches = re.findall(pattern, content)
-            for match in matches:
-                try:
-                    # Try different date formats
-                    for fmt in ["%d %b %Y", "%d/%m/%Y", "%m/%d/%Y", "%B %d, %Y", "%b %d, %Y"]:
-                        try:
-                            date_obj = datetime.strptime(match, fmt)
-                            found_dates.append(date_obj)
-                            break
-                        except ValueError:
-                            continue
-                except:
-                    continue
+        for match in _DATE_RE.finditer(content):
+            date_obj = _parse_date(match.group(), match.lastgroup)
+            if date_obj:
+                found_dates.append(date_obj)
         
         if found_dates:
             found_dates.sort()
@@ -414,7 +511,7 @@ class ProtocolDataAnalyzer:
         
         return "1.0"
     
-    def _extract_amendment_history(self, content: str) -> List[Dict]:
+    def _extract_amendment_history(self, content: str) -> List[Amendment]:
         """Extract amendment history"""
         amendments = []
         
@@ -427,15 +524,13 @@ class ProtocolDataAnalyzer:
         for pattern in amendment_patterns:
             matches = re.findall(pattern, content, re.IGNORECASE)
             for match in matches:
-                amendments.append({
-                    "number": match[0],
-                    "description": match[1].strip() if len(match) > 1 else "",
-                    "type": "global" if "global" in match[1].lower() else "local" if len(match) > 1 and "local" in match[1].lower() else "unknown"
-                })
+                description_lower = match[1].lower()
+                amendment_type = "global" if "global" in description_lower else "local" if "local" in description_lower else "unknown"
+                amendments.append(Amendment(match[0], match[1].strip(), amendment_type))
         
         return amendments
     
-    def _calculate_success_score(self, content: str, amendment_count: int, development_duration: Optional[int]) -> float:
+    def _calculate_success_score(self, keyword_counts: Dict[str, Counter], amendment_count: int, development_duration: Optional[int]) -> float:
         """Calculate protocol success score"""
         score = 0.5  # Base score
         
@@ -458,13 +553,9 @@ class ProtocolDataAnalyzer:
             elif development_duration > 2190:  # More than 6 years
                 score -= 0.2
         
-        # Success indicators in text
-        content_lower = content.lower()
-        success_terms = ["completed", "successful", "approved", "positive results", "met endpoint"]
-        failure_terms = ["terminated", "failed", "discontinued", "negative results", "futility"]
-        
-        success_count = sum(1 for term in success_terms if term in content_lower)
-        failure_count = sum(1 for term in failure_terms if term in content_lower)
+        # Success indicators in text (each distinct term counts once)
+        success_count = len(keyword_counts["success"])
+        failure_count = len(keyword_counts["failure"])
         
         score += (success_count - failure_count) * 0.1
         
@@ -472,14 +563,16 @@ class ProtocolDataAnalyzer:
     
     def _determine_completion_status(self, content: str) -> str:
         """Determine protocol completion status"""
-        content_lower = content.lower()
+        found = set()
+        for match in _STATUS_RE.finditer(content):
+            # Completed takes precedence wherever it appears
+            if match.lastgroup == "completed":
+                return "completed"
+            found.add(match.lastgroup)
         
-        if any(term in content_lower for term in ["completed", "finished", "concluded"]):
-            return "completed"
-        elif any(term in content_lower for term in ["ongoing", "recruiting", "active"]):
-            return "ongoing"
-        elif any(term in content_lower for term in ["terminated", "discontinued", "suspended"]):
-            return "terminated"
+        for status in ("ongoing", "terminated"):
+            if status in found:
+                return status
         
         return "unknown"
     
@@ -506,18 +599,10 @@ class ProtocolDataAnalyzer:
     def _extract_endpoint_types(self, content: str) -> List[str]:
         """Extract endpoint types"""
         endpoints = []
-        content_lower = content.lower()
-        
-        endpoint_patterns = {
-            "primary": r"primary\s+endpoint[s]?:\s*([^.]{10,200})",
-            "secondary": r"secondary\s+endpoint[s]?:\s*([^.]{10,200})",
-            "exploratory": r"exploratory\s+endpoint[s]?:\s*([^.]{10,200})"
-        }
         
-        for endpoint_type, pattern in endpoint_patterns.items():
-            matches = re.findall(pattern, content_lower)
-            for match in matches:
-                endpoints.append(f"{endpoint_type}: {match.strip()[:100]}")
+        for endpoint_type, pattern in _ENDPOINT_RES.items():
+            for match in pattern.finditer(content):
+                endpoints.append(f"{endpoint_type}: {match.group(1).strip()[:100]}")
         
         return endpoints
     
@@ -611,6 +696,12 @@ class ProtocolDataAnalyzer:
                     self.success_patterns[category]["common_study_types"][study_type] = 0
                 self.success_patterns[category]["common_study_types"][study_type] += 1
     
+    def _protocol_to_dict(self, protocol: ProtocolMetadata) -> Dict:
+        """Convert protocol metadata to a JSON-ready dict with amendments as mappings"""
+        record = asdict(protocol)
+        record["amendment_history"] = [amendment._asdict() for amendment in protocol.amendment_history]
+        return record
+    
     def save_analysis_results(self, output_file: str = "protocol_analysis_results.json"):
         """Save analysis results to JSON file"""
         results = {
@@ -620,7 +711,7 @@ class ProtocolDataAnalyzer:
                 "phases": len(self.phase_patterns),
                 "avg_success_score": sum(p.success_score for p in self.protocols.values()) / len(self.protocols) if self.protocols else 0
             },
-            "protocols": {pid: asdict(protocol) for pid, protocol in self.protocols.items()},
+            "protocols": {pid: self._protocol_to_dict(protocol) for pid, protocol in self.protocols.items()},
             "therapeutic_patterns": self.therapeutic_patterns,
             "phase_patterns": self.phase_patterns,
             "success_patterns": self.success_patterns
@@ -659,10 +750,14 @@ class ProtocolDataAnalyzer:
 
 # Global analyzer instance
 _protocol_analyzer = None
+_protocol_analyzer_lock = asyncio.Lock()
 
 async def get_protocol_analyzer():
     """Get or create global protocol analyzer"""
     global _protocol_analyzer
     if _protocol_analyzer is None:
-        _protocol_analyzer = ProtocolDataAnalyzer()
+        # Concurrent first callers wait here instead of each creating an analyzer
+        async with _protocol_analyzer_lock:
+            if _protocol_analyzer is None:
+                _protocol_analyzer = ProtocolDataAnalyzer()
     return _protocol_analyzer
\ No newline at end of file
@@ -3,6 +3,13 @@ Protocol Intelligence Database
 Comprehensive database of phrase improvements, regulatory guidance, and reviewer patterns
 """
 
+import re
+import sys
+from bisect import bisect_right
+from functools import lru_cache
+
+from keyword_automaton import KeywordAutomaton
+
 # Real-time Writing Suggestions Database
 PHRASE_IMPROVEMENTS = {
     # Timing & Dosing Precision
@@ -287,48 +294,264 @@ EXEMPLARY_PHRASES = {
     ]
 }
 
+def _freeze(value):
+    """
+    Recursively turn lists into tuples and intern every string
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return {_freeze(key): _freeze(item) for key, item in value.items()}
+    return value
+
+# The tables are read-only after import: tuples keep callers from mutating
+# shared suggestion lists and interned strings hash and compare cheaply
+PHRASE_IMPROVEMENTS = _freeze(PHRASE_IMPROVEMENTS)
+REGULATORY_PATTERNS = _freeze(REGULATORY_PATTERNS)
+FEASIBILITY_CONCERNS = _freeze(FEASIBILITY_CONCERNS)
+REVIEWER_COMMENT_CATEGORIES = _freeze(REVIEWER_COMMENT_CATEGORIES)
+EXEMPLARY_PHRASES = _freeze(EXEMPLARY_PHRASES)
+
+# Flat views of the tables, lowercased once at import, so the per-call
+# loops avoid nested dict walks and repeated .lower() calls
+_PHRASE_ENTRIES = tuple(
+    (phrase, sys.intern(phrase.lower()), data, data.get("context", ""))
+    for phrase, data in PHRASE_IMPROVEMENTS.items()
+)
+
+_FEASIBILITY_ENTRIES = tuple(
+    (concern_type, sys.intern(pattern.lower()), data)
+    for concern_type, data in FEASIBILITY_CONCERNS.items()
+    for pattern in data["patterns"]
+)
+
+_COMMENT_CATEGORY_ENTRIES = tuple(
+    (
+        category,
+        tuple(sys.intern(keyword.lower()) for keyword in data["keywords"]),
+        tuple(sys.intern(pattern.lower()) for pattern in data["patterns"]),
+        data["action_templates"]
+    )
+    for category, data in REVIEWER_COMMENT_CATEGORIES.items()
+)
+
+# Result dicts prebuilt per table entry; a hit only adds its position
+_PHRASE_TEMPLATES = tuple(
+    {
+        "original": phrase,
+        "suggestions": data["suggestions"],
+        "rationale": data["rationale"],
+        "category": data["category"],
+        "severity": data["severity"]
+    }
+    for phrase, _, data, _ in _PHRASE_ENTRIES
+)
+
+_FEASIBILITY_TEMPLATES = tuple(
+    {
+        "type": concern_type,
+        "concern": data["concern"],
+        "suggestions": data["suggestions"]
+    }
+    for concern_type, _, data in _FEASIBILITY_ENTRIES
+)
+
+def _build_phrase_automaton(context="general"):
+    """
+    Index the phrases that apply to a context by their position in the phrase table
+    """
+    automaton = KeywordAutomaton(ignore_case=True)
+    for entry_index, (_, phrase_lower, _, phrase_context) in enumerate(_PHRASE_ENTRIES):
+        if context == "general" or context in phrase_context:
+            automaton.add_word(phrase_lower, entry_index)
+    automaton.make_automaton()
+    return automaton
+
+def _build_phrase_automata_by_context():
+    """
+    Build one phrase automaton per context named in the phrase table
+    """
+    contexts = {"general"}
+    for _, _, _, phrase_context in _PHRASE_ENTRIES:
+        contexts.update(token.strip() for token in phrase_context.split(",") if token.strip())
+    return {context: _build_phrase_automaton(context) for context in sorted(contexts)}
+
+def _build_feasibility_automaton():
+    """
+    Index every feasibility pattern by its position in the pattern table
+    """
+    automaton = KeywordAutomaton(ignore_case=True)
+    for entry_index, (_, pattern_lower, _) in enumerate(_FEASIBILITY_ENTRIES):
+        automaton.add_word(pattern_lower, entry_index)
+    automaton.make_automaton()
+    return automaton
+
+def _build_comment_keyword_index():
+    """
+    Map each reviewer keyword to the bitmask of categories that list it
+    """
+    index = {}
+    for category_index, (_, keywords, _, _) in enumerate(_COMMENT_CATEGORY_ENTRIES):
+        for keyword in keywords:
+            index[keyword] = index.get(keyword, 0) | (1 << category_index)
+    return index
+
+def _build_comment_pattern_automaton():
+    """
+    Index every reviewer phrase pattern, tagged with its category bit
+    """
+    automaton = KeywordAutomaton(ignore_case=True)
+    for category_index, (_, _, patterns, _) in enumerate(_COMMENT_CATEGORY_ENTRIES):
+        for pattern in patterns:
+            automaton.add_word(pattern, 1 << category_index)
+    automaton.make_automaton()
+    return automaton
+
+# Specialized per context, so the scan only ever sees applicable phrases
+_PHRASE_AUTOMATA = _build_phrase_automata_by_context()
+_PHRASE_AUTOMATON = _PHRASE_AUTOMATA["general"]
+_FEASIBILITY_AUTOMATON = _build_feasibility_automaton()
+
+# Bit i stands for the i-th category, so the lowest set bit is the
+# highest-priority match
+_COMMENT_KEYWORD_BITS = _build_comment_keyword_index()
+_COMMENT_KEYWORDS = sorted(_COMMENT_KEYWORD_BITS, key=len, reverse=True)
+# Whole-word, case-insensitive match on the original text; each keyword is
+# its own named group so a hit maps to its bits without lowercasing
+_COMMENT_KEYWORD_RE = re.compile(
+    r"\b(?:" + "|".join(
+        f"(?P<k{keyword_index}>{re.escape(keyword)})" for keyword_index, keyword in enumerate(_COMMENT_KEYWORDS)
+    ) + r")\b",
+    re.IGNORECASE
+)
+_COMMENT_KEYWORD_GROUP_BITS = {
+    f"k{keyword_index}": _COMMENT_KEYWORD_BITS[keyword] for keyword_index, keyword in enumerate(_COMMENT_KEYWORDS)
+}
+_COMMENT_PATTERN_AUTOMATON = _build_comment_pattern_automaton()
+
+# Never occurs in keywords, so batched scans cannot match across segments
+_SEGMENT_SEPARATOR = "\x00"
+
+def _first_positions(automaton, entries, text):
+    """
+    Map each matched table entry to the start of its first occurrence
+
+    Matches are leftmost-longest, so an entry nested in a longer match
+    (e.g. "daily" inside "twice daily") is not reported for that span
+    """
+    first_positions = {}
+    for end_index, entry_index in automaton.iter_longest(text):
+        if entry_index not in first_positions:
+            first_positions[entry_index] = end_index - len(entries[entry_index][1]) + 1
+    return first_positions
+
+def _first_positions_by_segment(automaton, entries, segments):
+    """
+    Run one automaton scan over all segments and split the hits per segment
+    """
+    segment_starts = []
+    offset = 0
+    for segment in segments:
+        segment_starts.append(offset)
+        offset += len(segment) + len(_SEGMENT_SEPARATOR)
+    
+    positions_by_segment = [{} for _ in segments]
+    for end_index, entry_index in automaton.iter_longest(_SEGMENT_SEPARATOR.join(segments)):
+        start = end_index - len(entries[entry_index][1]) + 1
+        segment_index = bisect_right(segment_starts, start) - 1
+        first_positions = positions_by_segment[segment_index]
+        if entry_index not in first_positions:
+            first_positions[entry_index] = start - segment_starts[segment_index]
+    return positions_by_segment
+
+def _filter_phrase_context(first_positions, context):
+    """
+    Keep the phrases whose context string contains the requested context
+    """
+    return {
+        entry_index: position
+        for entry_index, position in first_positions.items()
+        if context in _PHRASE_ENTRIES[entry_index][3]
+    }
+
+def _build_phrase_suggestions(first_positions):
+    """
+    Turn matched phrase positions into suggestion dicts, in table order
+    """
+    # Only phrases that matched are visited
+    return [
+        {**_PHRASE_TEMPLATES[entry_index], "position": first_positions[entry_index]}
+        for entry_index in sorted(first_positions)
+    ]
+
+def _build_feasibility_concerns(first_positions):
+    """
+    Turn matched pattern positions into concern dicts, in table order
+    """
+    # Only patterns that matched are visited
+    return [
+        {**_FEASIBILITY_TEMPLATES[entry_index], "position": first_positions[entry_index]}
+        for entry_index in sorted(first_positions)
+    ]
+
+# Results are memoized per input text; the public functions hand out copies
+# so callers can keep mutating what they receive
+_ANALYSIS_CACHE_SIZE = 4096
+
 def get_phrase_suggestions(text_segment, context="general"):
     """
     Get intelligent suggestions for a text segment
     """
-    suggestions = []
-    
-    for phrase, data in PHRASE_IMPROVEMENTS.items():
-        if phrase.lower() in text_segment.lower():
-            if context == "general" or context in data.get("context", ""):
-                suggestions.append({
-                    "original": phrase,
-                    "suggestions": data["suggestions"],
-                    "rationale": data["rationale"],
-                    "category": data["category"],
-                    "severity": data["severity"],
-                    "position": text_segment.lower().find(phrase.lower())
-                })
-    
-    return suggestions
+    return [dict(suggestion) for suggestion in _cached_phrase_suggestions(text_segment, context)]
+
+@lru_cache(maxsize=_ANALYSIS_CACHE_SIZE)
+def _cached_phrase_suggestions(text_segment, context):
+    """
+    Memoized body of get_phrase_suggestions
+    """
+    # One case-insensitive pass over the original text finds the first
+    # occurrence of every phrase
+    automaton = _PHRASE_AUTOMATA.get(context)
+    if automaton is not None:
+        first_positions = _first_positions(automaton, _PHRASE_ENTRIES, text_segment)
+    else:
+        # Contexts outside the table keep the substring filter
+        first_positions = _first_positions(_PHRASE_AUTOMATON, _PHRASE_ENTRIES, text_segment)
+        first_positions = _filter_phrase_context(first_positions, context)
+    return tuple(_build_phrase_suggestions(first_positions))
 
 def categorize_reviewer_comment(comment_text):
     """
     Categorize reviewer comments and suggest actions
     """
-    comment_lower = comment_text.lower()
+    return dict(_cached_comment_category(comment_text))
+
+@lru_cache(maxsize=_ANALYSIS_CACHE_SIZE)
+def _cached_comment_category(comment_text):
+    """
+    Memoized body of categorize_reviewer_comment
+    """
+    # One word-level scan for keywords and one automaton pass for phrase
+    # patterns, each folding its hits into a category bitmask
+    keyword_mask = 0
+    for match in _COMMENT_KEYWORD_RE.finditer(comment_text):
+        keyword_mask |= _COMMENT_KEYWORD_GROUP_BITS[match.lastgroup]
+    pattern_mask = 0
+    for _, category_bit in _COMMENT_PATTERN_AUTOMATON.iter(comment_text):
+        pattern_mask |= category_bit
     
-    for category, data in REVIEWER_COMMENT_CATEGORIES.items():
-        # Check for keywords
-        if any(keyword in comment_lower for keyword in data["keywords"]):
-            return {
-                "category": category,
-                "confidence": "high",
-                "suggested_actions": data["action_templates"]
-            }
-        
-        # Check for patterns
-        if any(pattern.lower() in comment_lower for pattern in data["patterns"]):
-            return {
-                "category": category,
-                "confidence": "medium",
-                "suggested_actions": data["action_templates"]
-            }
+    # Category order still decides priority, keywords before patterns
+    mask = keyword_mask | pattern_mask
+    if mask:
+        winning_bit = mask & -mask
+        category, _, _, action_templates = _COMMENT_CATEGORY_ENTRIES[winning_bit.bit_length() - 1]
+        return {
+            "category": category,
+            "confidence": "high" if keyword_mask & winning_bit else "medium",
+            "suggested_actions": action_templates
+        }
     
     return {
         "category": "general_comment",
@@ -340,17 +563,36 @@ def assess_feasibility_concerns(text_segment):
     """
     Identify potential operational feasibility issues
     """
-    concerns = []
-    text_lower = text_segment.lower()
-    
-    for concern_type, data in FEASIBILITY_CONCERNS.items():
-        for pattern in data["patterns"]:
-            if pattern in text_lower:
-                concerns.append({
-                    "type": concern_type,
-                    "concern": data["concern"],
-                    "suggestions": data["suggestions"],
-                    "position": text_lower.find(pattern)
-                })
-    
-    return concerns
\ No newline at end of file
+    return [dict(concern) for concern in _cached_feasibility_concerns(text_segment)]
+
+@lru_cache(maxsize=_ANALYSIS_CACHE_SIZE)
+def _cached_feasibility_concerns(text_segment):
+    """
+    Memoized body of assess_feasibility_concerns
+    """
+    # One case-insensitive pass over the original text finds the first
+    # occurrence of every pattern
+    first_positions = _first_positions(_FEASIBILITY_AUTOMATON, _FEASIBILITY_ENTRIES, text_segment)
+    return tuple(_build_feasibility_concerns(first_positions))
+
+def get_phrase_suggestions_batch(text_segments, context="general"):
+    """
+    Get phrase suggestions for many text segments with a single automaton scan
+    """
+    segments = list(text_segments)
+    automaton = _PHRASE_AUTOMATA.get(context)
+    if automaton is not None:
+        positions_by_segment = _first_positions_by_segment(automaton, _PHRASE_ENTRIES, segments)
+    else:
+        positions_by_segment = [
+            _filter_phrase_context(first_positions, context)
+            for first_positions in _first_positions_by_segment(_PHRASE_AUTOMATON, _PHRASE_ENTRIES, segments)
+        ]
+    return [_build_phrase_suggestions(first_positions) for first_positions in positions_by_segment]
+
+def assess_feasibility_concerns_batch(text_segments):
+    """
+    Identify feasibility issues in many text segments with a single automaton scan
+    """
+    positions_by_segment = _first_positions_by_segment(_FEASIBILITY_AUTOMATON, _FEASIBILITY_ENTRIES, list(text_segments))
+    return [_build_feasibility_concerns(first_positions) for first_positions in positions_by_segment]
@@ -4,17 +4,66 @@ Analyzes protocol database to identify successful patterns and language
 """
 
 import json
+import heapq
+import itertools
+import asyncio
 import logging
 import numpy as np
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Tuple, Optional
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from collections import defaultdict
-import re
+from collections import Counter, defaultdict
+
+from keyword_automaton import KeywordAutomaton
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Protocols sampled per analysis and scored per page
+ANALYSIS_SAMPLE_SIZE = 2000
+ANALYSIS_PAGE_SIZE = 128
+
+# Neutral query vector for indexes that cannot be scanned, built once
+ANALYSIS_QUERY_VECTOR = [0.5] * 1024
+
+# Weights of the approval, amendment, timeline, compliance and recruitment
+# sub-scores in the overall success score
+SUCCESS_SCORE_WEIGHTS = (0.35, 0.25, 0.15, 0.15, 0.10)
+
+def _is_word_char(char: str) -> bool:
+    """Whether a character counts as part of a word, as for regex \\w"""
+    return char.isalnum() or char == "_"
+
+def _consolidated_confidence(frequency: int) -> float:
+    """Confidence of a pattern seen frequency times: 0.8 plus 0.05 per repeat, capped at 0.95"""
+    # Stepwise like the incremental updates it replaces, so values match exactly
+    confidence = 0.8
+    for _ in range(frequency - 1):
+        confidence = min(0.95, confidence + 0.05)
+        if confidence == 0.95:
+            break
+    return confidence
+
+def _weighted_success_score(sub_scores: Tuple[float, ...]) -> float:
+    """Combine the five sub-scores into the overall success score"""
+    success_score = 0.0
+    for sub_score, weight in zip(sub_scores, SUCCESS_SCORE_WEIGHTS):
+        success_score += sub_score * weight
+    return success_score
+
+def _grown(column: np.ndarray, extra_rows: int) -> np.ndarray:
+    """A copy of a column with extra_rows uninitialized rows appended"""
+    return np.concatenate([column, np.empty(extra_rows, dtype=column.dtype)])
+
+def _weighted_success_scores(sub_score_matrix: np.ndarray) -> np.ndarray:
+    """Vectorized _weighted_success_score over one row of sub-scores per protocol"""
+    # Column-wise accumulation keeps the scalar summation order, so scores
+    # on the 0.4/0.5/0.7 thresholds classify exactly as they do one at a time
+    success_scores = np.zeros(len(sub_score_matrix))
+    for column, weight in enumerate(SUCCESS_SCORE_WEIGHTS):
+        success_scores += sub_score_matrix[:, column] * weight
+    return success_scores
+
+@dataclass(slots=True, frozen=True)
 class ProtocolSuccess:
     """Protocol success metrics"""
     protocol_id: str
@@ -27,7 +76,15 @@ class ProtocolSuccess:
     success_factors: List[str]
     risk_factors: List[str]
 
-@dataclass
+class ScoreComponents(NamedTuple):
+    """Unweighted scoring results for one protocol"""
+    metadata: Dict
+    keyword_counts: Dict[str, Counter]
+    factor_mask: int
+    amendment_count: int
+    sub_scores: Tuple[float, float, float, float, float]
+
+@dataclass(slots=True)
 class SuccessPattern:
     """Successful language/structure pattern"""
     pattern_id: str
@@ -39,13 +96,30 @@ class SuccessPattern:
     frequency: int
     confidence: float
     examples: List[str]
+    pattern_text_lower: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.pattern_text_lower = self.pattern_text.lower()
 
 class ProtocolSuccessScorer:
     """Analyzes protocol database to identify success patterns"""
     
     def __init__(self):
+        # Scored protocols are stored column-wise, one row per protocol;
+        # success_cache maps protocol ids to rows and ProtocolSuccess
+        # records are built from a row on demand. Arrays grow by doubling.
         self.success_cache = {}
+        self.success_score_sum = 0.0  # Running total over success_cache
+        self.scored_protocol_ids = []
+        self.approval_statuses = []
+        self.success_scores = np.empty(0, dtype=np.float64)
+        self.timeline_scores = np.empty(0, dtype=np.float64)
+        self.compliance_scores = np.empty(0, dtype=np.float64)
+        self.recruitment_scores = np.empty(0, dtype=np.float64)
+        self.amendment_counts = np.empty(0, dtype=np.int32)
+        self.factor_masks = np.empty(0, dtype=np.int64)
         self.pattern_cache = {}
+        self.pattern_buckets = {}
         self.success_metrics = {}
         self.learning_data = {}
         
@@ -80,83 +154,290 @@ class ProtocolSuccessScorer:
                 "standard of care", "institutional review board", "IRB", "ethics committee"
             ]
         }
+        
+        # Timeline indicators
+        self.timeline_indicators = {
+            "efficiency": [
+                "ahead of schedule", "on time", "completed as planned", "met timeline",
+                "efficient recruitment", "rapid enrollment"
+            ],
+            "delay": [
+                "delayed", "behind schedule", "extended timeline", "recruitment challenges",
+                "slow enrollment", "timeline extension"
+            ]
+        }
+        
+        # Recruitment indicators
+        self.recruitment_indicators = {
+            "success": [
+                "successful recruitment", "met enrollment", "completed recruitment",
+                "rapid enrollment", "enrollment exceeded", "target achieved"
+            ],
+            "issues": [
+                "recruitment challenges", "slow enrollment", "enrollment difficulties",
+                "failed to recruit", "recruitment terminated", "enrollment suspended"
+            ]
+        }
+        
+        # Success factor phrases, keyed by the factor they indicate
+        self.success_factor_phrases = {
+            "Clear objectives and criteria": ["clear objectives", "well-defined", "specific criteria"],
+            "Appropriate statistical design": ["adequate sample size", "statistical power", "power calculation"],
+            "Experienced investigation team": ["experienced investigator", "qualified site", "established center"],
+            "Strong regulatory compliance": ["regulatory guidance", "ICH-GCP", "standard of care"],
+            "Patient-focused design": ["patient-centric", "patient reported", "quality of life"]
+        }
+        
+        # Risk factor phrases, keyed by the factor they indicate
+        self.risk_factor_phrases = {
+            "Complex protocol design": ["complex design", "multiple endpoints", "complicated"],
+            "Vague language and criteria": ["as needed", "appropriate", "reasonable"],
+            "Recruitment challenges": ["rare disease", "limited population", "difficult recruitment"],
+            "High-risk endpoints": ["novel endpoint", "exploratory", "experimental"]
+        }
+        
+        # One bit per factor, so factor checks are mask tests after the scan
+        self.factor_bits = {
+            factor: 1 << bit
+            for bit, factor in enumerate([*self.success_factor_phrases, *self.risk_factor_phrases])
+        }
+        
+        # Every keyword list in one case-insensitive matcher, so scoring a
+        # protocol is a single pass over its text
+        self.keyword_automaton = self._build_keyword_automaton()
+        
+        # Amendment mentions are counted per occurrence and only as whole words
+        self.amendment_indicators_lower = [
+            indicator.lower() for indicator in self.success_indicators["amendment_indicators"]
+        ]
+    
+    def _build_keyword_automaton(self) -> KeywordAutomaton:
+        """Index every scoring and factor keyword, tagged with its category and factor bit"""
+        automaton = KeywordAutomaton(ignore_case=True)
+        for indicators in (
+            self.success_indicators, self.quality_indicators,
+            self.timeline_indicators, self.recruitment_indicators
+        ):
+            for category, keywords in indicators.items():
+                if category == "amendment_indicators":
+                    # Counted separately by amendment_pattern
+                    continue
+                for keyword in keywords:
+                    automaton.add_word(keyword, (category, keyword.lower(), 0))
+        
+        for factor_phrases in (self.success_factor_phrases, self.risk_factor_phrases):
+            for factor, phrases in factor_phrases.items():
+                for phrase in phrases:
+                    automaton.add_word(phrase, (factor, phrase.lower(), self.factor_bits[factor]))
+        
+        automaton.make_automaton()
+        return automaton
+    
+    def _scan_keywords(self, text: str) -> Tuple[Dict[str, Counter], int]:
+        """Count indicator keywords per category and collect factor bits in one pass"""
+        keyword_counts = defaultdict(Counter)
+        factor_mask = 0
+        for _, (category, keyword, factor_bit) in self.keyword_automaton.iter(text):
+            if factor_bit:
+                factor_mask |= factor_bit
+            else:
+                keyword_counts[category][keyword] += 1
+        return keyword_counts, factor_mask
     
     async def analyze_protocol_success(self, protocol_database, ml_client):
         """Analyze all protocols in database for success patterns"""
         logger.info("📊 Analyzing protocol database for success patterns...")
         
         try:
-            # Query all protocols
-            results = protocol_database.query(
-                vector=[0.5] * 1024,
-                top_k=2000,  # Analyze large sample
-                include_metadata=True
-            )
-            
-            protocol_successes = []
-            
-            for match in results.matches:
-                metadata = match.metadata
-                text = metadata.get("text", "")
-                
-                if len(text) < 200:
-                    continue
-                
-                # Calculate success score
-                success_data = await self._calculate_success_score(metadata, text, ml_client)
-                if success_data:
-                    protocol_successes.append(success_data)
+            # Score page by page so only one page of protocols is in flight
+            rows = []
+            for page in self._iter_protocol_pages(protocol_database):
+                rows.extend(await self._score_protocol_page(page, ml_client))
             
             # Analyze patterns from successful protocols
-            await self._identify_success_patterns(protocol_successes, ml_client)
+            await self._identify_success_patterns(np.array(rows, dtype=np.intp), ml_client)
             
-            logger.info(f"✅ Analyzed {len(protocol_successes)} protocols for success patterns")
+            logger.info(f"✅ Analyzed {len(rows)} protocols for success patterns")
             
         except Exception as e:
             logger.error(f"Protocol success analysis failed: {e}")
     
+    def _iter_protocol_pages(self, protocol_database, page_size: int = ANALYSIS_PAGE_SIZE):
+        """Yield the metadata of the sampled protocols in pages"""
+        id_pages = self._list_protocol_ids(protocol_database, page_size)
+        if id_pages is not None:
+            # Scan the index and fetch one page of protocols at a time
+            remaining = ANALYSIS_SAMPLE_SIZE
+            for ids in id_pages:
+                ids = ids[:remaining]
+                if not ids:
+                    break
+                
+                vectors = protocol_database.fetch(ids=ids).vectors
+                yield [vectors[vector_id].metadata or {} for vector_id in ids if vector_id in vectors]
+                remaining -= len(ids)
+            return
+        
+        # Query all protocols
+        results = protocol_database.query(
+            vector=ANALYSIS_QUERY_VECTOR,
+            top_k=ANALYSIS_SAMPLE_SIZE,  # Analyze large sample
+            include_metadata=True
+        )
+        
+        # Similarity queries have no offset, so the result set is paged here
+        matches = results.matches
+        for start in range(0, len(matches), page_size):
+            yield [match.metadata for match in matches[start:start + page_size]]
+    
+    def _list_protocol_ids(self, protocol_database, page_size: int):
+        """Pages of vector ids from the index list API, or None when the index cannot be listed"""
+        list_ids = getattr(protocol_database, "list", None)
+        if list_ids is None:
+            return None
+        
+        # Only serverless indexes can be listed; pod indexes fail on the first page
+        try:
+            id_pages = iter(list_ids(limit=page_size))
+            first_page = next(id_pages, None)
+        except Exception as e:
+            logger.info(f"Index listing unavailable, sampling by query instead: {e}")
+            return None
+        
+        if first_page is None:
+            return iter(())
+        return itertools.chain([first_page], id_pages)
+    
+    async def _score_protocol_page(self, page: List[Dict], ml_client) -> List[int]:
+        """Score one page of protocol metadata, returning the score rows of its protocols"""
+        # Each new protocol is scored once; repeats reuse the cached row
+        protocol_ids = []
+        pending_protocols = {}
+        for metadata in page:
+            text = metadata.get("text", "")
+            
+            if len(text) < 200:
+                continue
+            
+            protocol_id = self._protocol_id(metadata, text)
+            protocol_ids.append(protocol_id)
+            if protocol_id not in self.success_cache and protocol_id not in pending_protocols:
+                pending_protocols[protocol_id] = (metadata, text)
+        
+        # Score the page concurrently so any awaited ml_client work overlaps
+        all_components = await asyncio.gather(*(
+            self._calculate_score_components(metadata, text, ml_client)
+            for metadata, text in pending_protocols.values()
+        ))
+        scored_protocols = [
+            (protocol_id, components)
+            for protocol_id, components in zip(pending_protocols, all_components)
+            if components is not None
+        ]
+        
+        # Weight the sub-scores of the page in one vectorized step
+        if scored_protocols:
+            sub_score_matrix = np.array([components.sub_scores for _, components in scored_protocols])
+            success_scores = _weighted_success_scores(sub_score_matrix)
+            for (protocol_id, components), success_score in zip(scored_protocols, success_scores.tolist()):
+                self._store_protocol_scores(protocol_id, components, success_score)
+        
+        return [
+            self.success_cache[protocol_id] for protocol_id in protocol_ids
+            if protocol_id in self.success_cache
+        ]
+    
+    def _protocol_id(self, metadata: Dict, text: str) -> str:
+        """Protocol id from metadata, falling back to a hash of the opening text"""
+        # Only hash the text when the metadata carries no id
+        protocol_id = metadata.get("protocol_id")
+        if protocol_id is None:
+            protocol_id = hash(text[:100])
+        return str(protocol_id)
+    
     async def _calculate_success_score(self, metadata: Dict, text: str, ml_client) -> Optional[ProtocolSuccess]:
         """Calculate success score for a single protocol"""
+        protocol_id = self._protocol_id(metadata, text)
+        
+        # Protocols already scored are not scored again
+        cached_row = self.success_cache.get(protocol_id)
+        if cached_row is not None:
+            return self._protocol_success(cached_row)
+        
+        components = await self._calculate_score_components(metadata, text, ml_client)
+        if components is None:
+            return None
+        
+        # Overall success score (weighted average)
+        success_score = _weighted_success_score(components.sub_scores)
+        return self._protocol_success(self._store_protocol_scores(protocol_id, components, success_score))
+    
+    async def _calculate_score_components(self, metadata: Dict, text: str, ml_client) -> Optional[ScoreComponents]:
+        """Calculate the unweighted sub-scores for a single protocol"""
         try:
-            protocol_id = metadata.get("protocol_id", hash(text[:100]))
+            # One pass over the text feeds every metric and factor check
+            keyword_counts, factor_mask = self._scan_keywords(text)
+            amendment_count = self._count_amendments(text)
             
             # Calculate individual metrics
-            approval_score = self._calculate_approval_score(metadata, text)
-            amendment_score = self._calculate_amendment_score(metadata, text)
-            timeline_score = self._calculate_timeline_score(metadata, text)
-            compliance_score = self._calculate_compliance_score(text)
-            recruitment_score = self._calculate_recruitment_score(metadata, text)
-            
-            # Overall success score (weighted average)
-            success_score = (
-                approval_score * 0.35 +
-                amendment_score * 0.25 +
-                timeline_score * 0.15 +
-                compliance_score * 0.15 +
-                recruitment_score * 0.10
-            )
-            
-            # Identify success and risk factors
-            success_factors = self._identify_success_factors(text, success_score)
-            risk_factors = self._identify_risk_factors(text, success_score)
-            
-            return ProtocolSuccess(
-                protocol_id=str(protocol_id),
-                success_score=success_score,
-                approval_status=metadata.get("approval_status", "unknown"),
-                amendment_count=self._count_amendments(text),
-                timeline_efficiency=timeline_score,
-                regulatory_compliance_score=compliance_score,
-                recruitment_success=recruitment_score,
-                success_factors=success_factors,
-                risk_factors=risk_factors
+            sub_scores = (
+                self._calculate_approval_score(metadata, keyword_counts),
+                self._calculate_amendment_score(metadata, amendment_count),
+                self._calculate_timeline_score(metadata, keyword_counts),
+                self._calculate_compliance_score(keyword_counts),
+                self._calculate_recruitment_score(metadata, keyword_counts)
             )
+            return ScoreComponents(metadata, keyword_counts, factor_mask, amendment_count, sub_scores)
             
         except Exception as e:
             logger.warning(f"Could not calculate success score: {e}")
             return None
     
-    def _calculate_approval_score(self, metadata: Dict, text: str) -> float:
+    def _store_protocol_scores(self, protocol_id: str, components: ScoreComponents, success_score: float) -> int:
+        """Append a scored protocol to the score columns and return its row"""
+        row = len(self.scored_protocol_ids)
+        if row == len(self.success_scores):
+            extra_rows = max(ANALYSIS_PAGE_SIZE, row)
+            self.success_scores = _grown(self.success_scores, extra_rows)
+            self.timeline_scores = _grown(self.timeline_scores, extra_rows)
+            self.compliance_scores = _grown(self.compliance_scores, extra_rows)
+            self.recruitment_scores = _grown(self.recruitment_scores, extra_rows)
+            self.amendment_counts = _grown(self.amendment_counts, extra_rows)
+            self.factor_masks = _grown(self.factor_masks, extra_rows)
+        
+        _, _, timeline_score, compliance_score, recruitment_score = components.sub_scores
+        self.scored_protocol_ids.append(protocol_id)
+        self.approval_statuses.append(components.metadata.get("approval_status", "unknown"))
+        self.success_scores[row] = success_score
+        self.timeline_scores[row] = timeline_score
+        self.compliance_scores[row] = compliance_score
+        self.recruitment_scores[row] = recruitment_score
+        self.amendment_counts[row] = components.amendment_count
+        self.factor_masks[row] = components.factor_mask
+        
+        self.success_cache[protocol_id] = row
+        self.success_score_sum += success_score
+        return row
+    
+    def _protocol_success(self, row: int) -> ProtocolSuccess:
+        """Success record of one row of the score columns"""
+        success_score = float(self.success_scores[row])
+        factor_mask = int(self.factor_masks[row])
+        
+        # Factors only matter for clearly strong or weak protocols
+        return ProtocolSuccess(
+            protocol_id=self.scored_protocol_ids[row],
+            success_score=success_score,
+            approval_status=self.approval_statuses[row],
+            amendment_count=int(self.amendment_counts[row]),
+            timeline_efficiency=float(self.timeline_scores[row]),
+            regulatory_compliance_score=float(self.compliance_scores[row]),
+            recruitment_success=float(self.recruitment_scores[row]),
+            success_factors=self._identify_success_factors(factor_mask) if success_score > 0.7 else [],
+            risk_factors=self._identify_risk_factors(factor_mask) if success_score < 0.5 else []
+        )
+    
+    def _calculate_approval_score(self, metadata: Dict, keyword_counts: Dict[str, Counter]) -> float:
         """Calculate approval success score"""
         # Check metadata for explicit approval status
         approval_status = metadata.get("approval_status", "").lower()
@@ -166,12 +447,8 @@ class ProtocolSuccessScorer:
             return 0.1
         
         # Analyze text for success/failure indicators
-        text_lower = text.lower()
-        
-        success_count = sum(1 for keyword in self.success_indicators["approval_keywords"] 
-                           if keyword in text_lower)
-        failure_count = sum(1 for keyword in self.success_indicators["failure_keywords"] 
-                           if keyword in text_lower)
+        success_count = len(keyword_counts["approval_keywords"])
+        failure_count = len(keyword_counts["failure_keywords"])
         
         if success_count > failure_count:
             return min(0.8, 0.5 + (success_count - failure_count) * 0.1)
@@ -180,10 +457,8 @@ class ProtocolSuccessScorer:
         
         return 0.5  # Neutral if no clear indicators
     
-    def _calculate_amendment_score(self, metadata: Dict, text: str) -> float:
+    def _calculate_amendment_score(self, metadata: Dict, amendment_count: int) -> float:
         """Calculate amendment/modification score (fewer amendments = higher score)"""
-        amendment_count = self._count_amendments(text)
-        
         # Score based on amendment frequency
         if amendment_count == 0:
             return 0.9
@@ -196,28 +471,26 @@ class ProtocolSuccessScorer:
     
     def _count_amendments(self, text: str) -> int:
         """Count protocol amendments mentioned in text"""
+        # The indicators are literals, so plain str.find on one lowercased copy
+        # beats a case-insensitive regex; only whole-word hits count
+        text_lower = text.lower()
+        text_length = len(text_lower)
         amendment_count = 0
-        for indicator in self.success_indicators["amendment_indicators"]:
-            amendment_count += len(re.findall(indicator, text, re.IGNORECASE))
+        for indicator in self.amendment_indicators_lower:
+            start = text_lower.find(indicator)
+            while start != -1:
+                end = start + len(indicator)
+                if ((start == 0 or not _is_word_char(text_lower[start - 1]))
+                        and (end == text_length or not _is_word_char(text_lower[end]))):
+                    amendment_count += 1
+                start = text_lower.find(indicator, end)
         return amendment_count
     
-    def _calculate_timeline_score(self, metadata: Dict, text: str) -> float:
+    def _calculate_timeline_score(self, metadata: Dict, keyword_counts: Dict[str, Counter]) -> float:
         """Calculate timeline efficiency score"""
         # Look for timeline-related issues
-        text_lower = text.lower()
-        
-        efficiency_indicators = [
-            "ahead of schedule", "on time", "completed as planned", "met timeline",
-            "efficient recruitment", "rapid enrollment"
-        ]
-        
-        delay_indicators = [
-            "delayed", "behind schedule", "extended timeline", "recruitment challenges",
-            "slow enrollment", "timeline extension"
-        ]
-        
-        efficiency_score = sum(1 for indicator in efficiency_indicators if indicator in text_lower)
-        delay_score = sum(1 for indicator in delay_indicators if indicator in text_lower)
+        efficiency_score = len(keyword_counts["efficiency"])
+        delay_score = len(keyword_counts["delay"])
         
         if efficiency_score > delay_score:
             return min(0.9, 0.6 + efficiency_score * 0.1)
@@ -226,19 +499,14 @@ class ProtocolSuccessScorer:
         
         return 0.6  # Default neutral score
     
-    def _calculate_compliance_score(self, text: str) -> float:
+    def _calculate_compliance_score(self, keyword_counts: Dict[str, Counter]) -> float:
         """Calculate regulatory compliance score"""
-        text_lower = text.lower()
-        
         # Count regulatory language usage
-        regulatory_count = sum(1 for phrase in self.quality_indicators["regulatory_language"] 
-                              if phrase in text_lower)
+        regulatory_count = len(keyword_counts["regulatory_language"])
         
         # Count clear vs vague language
-        clear_count = sum(1 for phrase in self.quality_indicators["clear_language"] 
-                         if phrase in text_lower)
-        vague_count = sum(1 for phrase in self.quality_indicators["vague_language"] 
-                         if phrase in text_lower)
+        clear_count = len(keyword_counts["clear_language"])
+        vague_count = len(keyword_counts["vague_language"])
         
         # Calculate compliance score
         regulatory_score = min(0.4, regulatory_count * 0.05)
@@ -246,22 +514,10 @@ class ProtocolSuccessScorer:
         
         return max(0.1, regulatory_score + clarity_score)
     
-    def _calculate_recruitment_score(self, metadata: Dict, text: str) -> float:
+    def _calculate_recruitment_score(self, metadata: Dict, keyword_counts: Dict[str, Counter]) -> float:
         """Calculate recruitment success score"""
-        text_lower = text.lower()
-        
-        recruitment_success = [
-            "successful recruitment", "met enrollment", "completed recruitment",
-            "rapid enrollment", "enrollment exceeded", "target achieved"
-        ]
-        
-        recruitment_issues = [
-            "recruitment challenges", "slow enrollment", "enrollment difficulties",
-            "failed to recruit", "recruitment terminated", "enrollment suspended"
-        ]
-        
-        success_indicators = sum(1 for phrase in recruitment_success if phrase in text_lower)
-        issue_indicators = sum(1 for phrase in recruitment_issues if phrase in text_lower)
+        success_indicators = len(keyword_counts["success"])
+        issue_indicators = len(keyword_counts["issues"])
         
         if success_indicators > issue_indicators:
             return min(0.9, 0.6 + success_indicators * 0.1)
@@ -270,120 +526,68 @@ class ProtocolSuccessScorer:
         
         return 0.6
     
-    def _identify_success_factors(self, text: str, success_score: float) -> List[str]:
-        """Identify factors contributing to protocol success"""
-        factors = []
-        text_lower = text.lower()
-        
-        if success_score > 0.7:
-            # Look for specific success factors
-            if any(phrase in text_lower for phrase in ["clear objectives", "well-defined", "specific criteria"]):
-                factors.append("Clear objectives and criteria")
-            
-            if any(phrase in text_lower for phrase in ["adequate sample size", "statistical power", "power calculation"]):
-                factors.append("Appropriate statistical design")
-            
-            if any(phrase in text_lower for phrase in ["experienced investigator", "qualified site", "established center"]):
-                factors.append("Experienced investigation team")
-            
-            if any(phrase in text_lower for phrase in ["regulatory guidance", "ICH-GCP", "standard of care"]):
-                factors.append("Strong regulatory compliance")
-            
-            if any(phrase in text_lower for phrase in ["patient-centric", "patient reported", "quality of life"]):
-                factors.append("Patient-focused design")
-        
-        return factors
+    def _identify_success_factors(self, factor_mask: int) -> List[str]:
+        """Identify factors contributing to protocol success (for scores above 0.7)"""
+        return [factor for factor in self.success_factor_phrases if factor_mask & self.factor_bits[factor]]
     
-    def _identify_risk_factors(self, text: str, success_score: float) -> List[str]:
-        """Identify factors that may contribute to protocol risk"""
-        factors = []
-        text_lower = text.lower()
-        
-        if success_score < 0.5:
-            # Look for risk factors
-            if any(phrase in text_lower for phrase in ["complex design", "multiple endpoints", "complicated"]):
-                factors.append("Complex protocol design")
-            
-            if any(phrase in text_lower for phrase in ["as needed", "appropriate", "reasonable"]):
-                factors.append("Vague language and criteria")
-            
-            if any(phrase in text_lower for phrase in ["rare disease", "limited population", "difficult recruitment"]):
-                factors.append("Recruitment challenges")
-            
-            if any(phrase in text_lower for phrase in ["novel endpoint", "exploratory", "experimental"]):
-                factors.append("High-risk endpoints")
-        
-        return factors
+    def _identify_risk_factors(self, factor_mask: int) -> List[str]:
+        """Identify factors that may contribute to protocol risk (for scores below 0.5)"""
+        return [factor for factor in self.risk_factor_phrases if factor_mask & self.factor_bits[factor]]
     
-    async def _identify_success_patterns(self, protocol_successes: List[ProtocolSuccess], ml_client):
-        """Identify successful language and structure patterns"""
+    async def _identify_success_patterns(self, rows: np.ndarray, ml_client):
+        """Identify successful language and structure patterns among the given score rows"""
         logger.info("🔍 Identifying successful patterns from high-performing protocols...")
         
         # Separate high and low performing protocols
-        high_performers = [p for p in protocol_successes if p.success_score > 0.7]
-        low_performers = [p for p in protocol_successes if p.success_score < 0.4]
+        success_scores = self.success_scores[rows]
+        high_performer_rows = rows[success_scores > 0.7]
+        low_performer_count = int(np.count_nonzero(success_scores < 0.4))
         
-        logger.info(f"Analyzing {len(high_performers)} high-performers vs {len(low_performers)} low-performers")
+        logger.info(f"Analyzing {len(high_performer_rows)} high-performers vs {low_performer_count} low-performers")
         
-        # Extract patterns from high performers
-        success_patterns = []
+        # Group the success factors of high performers by consolidation key;
+        # a SuccessPattern is only built once per distinct key
+        first_seen = {}
+        examples = defaultdict(list)
         pattern_id = 0
         
-        # Language patterns
-        for protocol in high_performers:
-            patterns = self._extract_language_patterns(protocol)
-            for pattern in patterns:
-                success_patterns.append(SuccessPattern(
-                    pattern_id=f"lang_{pattern_id}",
-                    pattern_type="language",
-                    pattern_text=pattern["text"],
-                    success_correlation=protocol.success_score,
-                    therapeutic_area=pattern.get("therapeutic_area", "general"),
-                    phase=pattern.get("phase", "general"),
-                    frequency=1,
-                    confidence=0.8,
-                    examples=[pattern["text"]]
-                ))
+        # Language patterns (for now, the success factors themselves)
+        high_performers = zip(self.success_scores[high_performer_rows].tolist(),
+                              self.factor_masks[high_performer_rows].tolist())
+        for success_score, factor_mask in high_performers:
+            for factor in self._identify_success_factors(factor_mask):
+                # Simple consolidation based on pattern text similarity
+                key = factor.lower().strip()
+                if key not in first_seen:
+                    first_seen[key] = (pattern_id, factor, success_score)
+                examples[key].append(factor)
                 pattern_id += 1
         
-        # Consolidate similar patterns
-        self.pattern_cache = self._consolidate_patterns(success_patterns)
+        self.pattern_cache = {
+            key: SuccessPattern(
+                pattern_id=f"lang_{first_id}",
+                pattern_type="language",
+                pattern_text=pattern_text,
+                success_correlation=success_correlation,
+                therapeutic_area="general",
+                phase="general",
+                frequency=len(examples[key]),
+                confidence=_consolidated_confidence(len(examples[key])),
+                examples=examples[key]
+            )
+            for key, (first_id, pattern_text, success_correlation) in first_seen.items()
+        }
+        self.pattern_buckets = self._index_patterns(self.pattern_cache)
         
         logger.info(f"✅ Identified {len(self.pattern_cache)} success patterns")
     
-    def _extract_language_patterns(self, protocol: ProtocolSuccess) -> List[Dict]:
-        """Extract successful language patterns from high-performing protocol"""
-        # This would extract specific successful phrases
-        # For now, return success factors as patterns
-        patterns = []
-        
-        for factor in protocol.success_factors:
-            patterns.append({
-                "text": factor,
-                "type": "success_factor",
-                "score": protocol.success_score
-            })
-        
-        return patterns
-    
-    def _consolidate_patterns(self, patterns: List[SuccessPattern]) -> Dict[str, SuccessPattern]:
-        """Consolidate similar patterns to avoid duplicates"""
-        consolidated = {}
-        
-        for pattern in patterns:
-            # Simple consolidation based on pattern text similarity
-            key = pattern.pattern_text.lower().strip()
-            
-            if key in consolidated:
-                # Update frequency and confidence
-                existing = consolidated[key]
-                existing.frequency += 1
-                existing.confidence = min(0.95, existing.confidence + 0.05)
-                existing.examples.append(pattern.pattern_text)
-            else:
-                consolidated[key] = pattern
-        
-        return consolidated
+    def _index_patterns(self, patterns: Dict[str, SuccessPattern]) -> Dict[Tuple[str, str], List[Tuple[int, SuccessPattern]]]:
+        """Bucket recommendable patterns by (therapeutic_area, phase), keeping cache order"""
+        buckets = defaultdict(list)
+        for position, pattern in enumerate(patterns.values()):
+            if pattern.success_correlation > 0.7:
+                buckets[(pattern.therapeutic_area, pattern.phase)].append((position, pattern))
+        return dict(buckets)
     
     def get_success_recommendations(self, therapeutic_area: str, phase: str, 
                                   current_text: str) -> List[Dict]:
@@ -391,19 +595,23 @@ class ProtocolSuccessScorer:
         recommendations = []
         
         # Filter patterns by therapeutic area and phase
-        relevant_patterns = [
-            pattern for pattern in self.pattern_cache.values()
-            if (pattern.therapeutic_area == therapeutic_area or pattern.therapeutic_area == "general")
-            and (pattern.phase == phase or pattern.phase == "general")
-            and pattern.success_correlation > 0.7
-        ]
-        
-        # Sort by success correlation and frequency
-        relevant_patterns.sort(key=lambda x: (x.success_correlation, x.frequency), reverse=True)
+        bucket_keys = dict.fromkeys([
+            (therapeutic_area, phase), (therapeutic_area, "general"),
+            ("general", phase), ("general", "general")
+        ])
+        relevant_patterns = (
+            pattern for _, pattern in heapq.merge(*(
+                self.pattern_buckets.get(bucket_key, []) for bucket_key in bucket_keys
+            ))
+        )
+        
+        # Top 5 by success correlation and frequency, without sorting every candidate
+        top_patterns = heapq.nlargest(5, relevant_patterns, key=lambda x: (x.success_correlation, x.frequency))
         
         # Generate recommendations
-        for pattern in relevant_patterns[:5]:  # Top 5 recommendations
-            if pattern.pattern_text.lower() not in current_text.lower():
+        current_text_lower = current_text.lower()
+        for pattern in top_patterns:  # Top 5 recommendations
+            if pattern.pattern_text_lower not in current_text_lower:
                 recommendations.append({
                     "type": "success_pattern",
                     "recommendation": f"Consider including: {pattern.pattern_text}",
@@ -416,12 +624,13 @@ class ProtocolSuccessScorer:
     
     def get_scorer_stats(self) -> Dict:
         """Get success scorer statistics"""
+        success_scores = self.success_scores[:len(self.scored_protocol_ids)]
         return {
             "protocols_analyzed": len(self.success_cache),
             "success_patterns_identified": len(self.pattern_cache),
-            "high_performers": len([p for p in self.success_cache.values() if p.success_score > 0.7]),
-            "low_performers": len([p for p in self.success_cache.values() if p.success_score < 0.4]),
-            "average_success_score": np.mean([p.success_score for p in self.success_cache.values()]) if self.success_cache else 0
+            "high_performers": int(np.count_nonzero(success_scores > 0.7)),
+            "low_performers": int(np.count_nonzero(success_scores < 0.4)),
+            "average_success_score": self.success_score_sum / len(self.success_cache) if self.success_cache else 0
         }
 
 # Global success scorer instance  
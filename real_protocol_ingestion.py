@@ -5,19 +5,159 @@ Ingests 16,730 real anonymized protocols into Pinecone with smart deduplication
 """
 
 import os
+import sys
 import json
 import logging
 import asyncio
 import hashlib
-from typing import List, Dict, Any, Optional
+import cProfile
+import pstats
+import random
+import time
+from collections import Counter
+import aiohttp
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 from tqdm import tqdm
 from datetime import datetime
 
+from bloom_filter import BloomFilter
+from embedding_cache import EmbeddingCache
+
+# Streaming JSON parser - fall back to loading the whole file if unavailable
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Fast JSON codec - fall back to the standard library if unavailable
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# gRPC status codes - only needed to recognise throttling from the gRPC Pinecone client
+try:
+    import grpc
+    GRPC_AVAILABLE = True
+except ImportError:
+    GRPC_AVAILABLE = False
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PROTOCOL_ANALYSIS_PATH = Path("real_protocol_analysis.json")
+DATA_SOURCE = "real_anonymized_protocols"
+PROFILE_OUTPUT_PATH = "ingestion.prof"
+
+EMBEDDING_CACHE_DIR = Path(".embedding_cache")  # float16 embeddings keyed by source and content hash
+# Per index and namespace: the vector count the ID filter was synced at, plus the persisted
+# Bloom filters of ingested protocol IDs, content hashes and metadata hashes
+ID_CACHE_DIR = Path(".pinecone_cache")
+BLOOM_FILTER_CAPACITY = 100_000
+BLOOM_FILTER_ERROR_RATE = 1e-6
+
+EMBEDDING_DIMENSION = 768
+ML_EMBEDDING_CONCURRENCY = 16  # Concurrent ML service calls per batch
+BATCH_CONCURRENCY = 8  # Batches in flight at once (and worker count)
+UPSERT_MAX_RETRIES = 5
+UPSERT_MAX_BACKOFF = 30.0  # Seconds
+UPSERT_VECTORS_PER_SECOND = float(os.getenv("PINECONE_MAX_VECTORS_PER_SECOND", "500"))
+UPSERT_MAX_VECTORS_PER_SECOND = 4 * UPSERT_VECTORS_PER_SECOND
+UPSERT_SPEEDUP_AFTER = 100  # Consecutive unthrottled upserts before raising the rate
+EMBEDDING_HTTP_CONNECTIONS = 32
+EMBEDDING_HTTP_TIMEOUT = 30  # Seconds
+ENDPOINT_MAX_INPUT_CHARS = 512  # Fallback endpoint inputs are cut to this length
+ML_SERVICE_MAX_INPUT_CHARS = 1000  # ml_service_client cuts PubMedBERT inputs to this length
+ID_LIST_PAGE_SIZE = 100  # Largest page the Pinecone list endpoint returns
+
+
+def metadata_hash(metadata: Dict) -> str:
+    """128-bit BLAKE2b digest of vector metadata, ignoring the per-run ingestion timestamp"""
+    return content_hash(repr(sorted(item for item in metadata.items() if item[0] != 'ingestion_timestamp')))
+
+
+def json_loads(data: bytes) -> Any:
+    """Decode JSON bytes, with orjson when installed"""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encode an object as JSON bytes, with orjson when installed"""
+    return orjson.dumps(obj) if ORJSON_AVAILABLE else json.dumps(obj).encode('utf-8')
+
+
+def _is_rate_limited(e: BaseException) -> bool:
+    """Whether a Pinecone error is throttling: HTTP 429, or gRPC RESOURCE_EXHAUSTED
+    (which the gRPC client wraps in a PineconeException with no status)"""
+    for error in (e, e.__cause__):
+        if error is None:
+            continue
+        if getattr(error, 'status', None) == 429:
+            return True
+        code = getattr(error, 'code', None)
+        if GRPC_AVAILABLE and callable(code) and code() == grpc.StatusCode.RESOURCE_EXHAUSTED:
+            return True
+    return False
+
+
+def as_embedding(values: Any) -> Optional[np.ndarray]:
+    """Values as a float32 embedding vector, or None if they are not one full-size vector"""
+    try:
+        vector = np.asarray(values, dtype=np.float32)
+    except (TypeError, ValueError):
+        return None
+    return vector if vector.shape == (EMBEDDING_DIMENSION,) else None
+
+
+def content_hash(text: str) -> str:
+    """128-bit BLAKE2b digest of an embedding text"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class AsyncTokenBucket:
+    """Token-bucket rate limiter for coroutines that adapts its rate to throttling"""
+    
+    def __init__(self, rate: float, capacity: float, max_rate: float, speedup_after: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = rate / 16
+        self.max_rate = max_rate
+        self.speedup_after = speedup_after
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._successes = 0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, tokens: float = 1):
+        """Wait until enough tokens have accrued, then take them"""
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+    
+    def record_success(self):
+        """Raise the rate by 10% after a sustained run of unthrottled requests"""
+        self._successes += 1
+        if self._successes >= self.speedup_after:
+            self.rate = min(self.max_rate, self.rate * 1.1)
+            self._successes = 0
+    
+    def record_throttle(self):
+        """Halve the rate after the server rejected a request as rate limited"""
+        self.rate = max(self.min_rate, self.rate * 0.5)
+        self._successes = 0
+
 class RealProtocolIngestion:
     """Ingest real protocol data into Pinecone with smart integration"""
     
@@ -27,16 +167,38 @@ class RealProtocolIngestion:
         self.total_ingested = 0
         self.duplicate_count = 0
         self.error_count = 0
+        self.changed_count = 0
+        self.metadata_updated_count = 0
+        self.stage_ns = Counter()  # Wall time per pipeline stage, in nanoseconds
+        self.run_ids = set()  # Exact set of protocol IDs seen this run
+        self.namespace_vector_count = 0
+        
+        # Embeddings of previously embedded texts, so reruns skip the embedding API
+        self.embedding_cache = EmbeddingCache(EMBEDDING_CACHE_DIR, EMBEDDING_DIMENSION)
+        
+        # Keep-alive session for the embedding endpoint, opened on first use
+        self._http: Optional[aiohttp.ClientSession] = None
+        
+        # Upsert rate limiter, created per ingestion run
+        self._upsert_limiter: Optional[AsyncTokenBucket] = None
         
         # Initialize clients
         self._initialize_clients()
         
+        # Bloom filters persisted for this index and namespace
+        self._load_bloom_filters()
+        
     def _initialize_clients(self):
         """Initialize Pinecone and ML clients"""
         try:
-            from pinecone import Pinecone
+            try:
+                # gRPC client ships vectors as binary protobuf rather than JSON float text
+                from pinecone.grpc import PineconeGRPC as Pinecone
+            except ImportError:
+                from pinecone import Pinecone
             self.pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
             index_name = os.getenv("PINECONE_INDEX_NAME", "clinical-protocols")
+            self.index_name = index_name
             self.index = self.pc.Index(index_name)
             logger.info(f"✅ Connected to Pinecone index: {index_name}")
         except Exception as e:
@@ -51,6 +213,38 @@ class RealProtocolIngestion:
             logger.warning("⚠️ ML service client not available, using fallback")
             self.ml_client = None
     
+    def _bloom_filter_path(self, kind: str) -> Path:
+        """Persisted Bloom filter of one kind ("ids", "content" or "metadata") for this index and namespace"""
+        return ID_CACHE_DIR / f"{self.index_name}_{self.namespace}_{kind}.bin"
+    
+    def _load_bloom_filters(self):
+        """Load the persisted ID, content-hash and metadata-hash filters for this index and namespace"""
+        # Protocol IDs already in Pinecone
+        self.existing_ids = BloomFilter.load(self._bloom_filter_path("ids"), BLOOM_FILTER_CAPACITY, BLOOM_FILTER_ERROR_RATE)
+        
+        # Content hashes of ingested embedding texts, to re-ingest protocols whose content changed
+        self.content_hashes = BloomFilter.load(self._bloom_filter_path("content"), BLOOM_FILTER_CAPACITY, BLOOM_FILTER_ERROR_RATE)
+        self.track_content_changes = not self.content_hashes.is_empty
+        
+        # Metadata hashes of ingested vectors, to patch metadata-only changes in place
+        self.metadata_hashes = BloomFilter.load(self._bloom_filter_path("metadata"), BLOOM_FILTER_CAPACITY, BLOOM_FILTER_ERROR_RATE)
+        self.track_metadata_changes = not self.metadata_hashes.is_empty
+    
+    def _reset_bloom_filters(self):
+        """Empty all three filters, e.g. after the namespace was deleted or recreated"""
+        self.existing_ids = BloomFilter(BLOOM_FILTER_CAPACITY, BLOOM_FILTER_ERROR_RATE)
+        self.content_hashes = BloomFilter(BLOOM_FILTER_CAPACITY, BLOOM_FILTER_ERROR_RATE)
+        self.metadata_hashes = BloomFilter(BLOOM_FILTER_CAPACITY, BLOOM_FILTER_ERROR_RATE)
+        self.track_content_changes = False
+        self.track_metadata_changes = False
+    
+    def _save_bloom_filters(self):
+        """Persist all three filters for this index and namespace"""
+        ID_CACHE_DIR.mkdir(exist_ok=True)
+        self.existing_ids.save(self._bloom_filter_path("ids"))
+        self.content_hashes.save(self._bloom_filter_path("content"))
+        self.metadata_hashes.save(self._bloom_filter_path("metadata"))
+    
     async def check_existing_data(self) -> Dict:
         """Check what's already in Pinecone and avoid duplicates"""
         logger.info("🔍 Checking existing data in Pinecone...")
@@ -78,32 +272,81 @@ class RealProtocolIngestion:
             logger.info(f"   Index fullness: {existing_data['index_fullness']:.2%}")
             logger.info(f"   Real protocols namespace: {existing_data['namespaces'].get(self.namespace, {}).get('vector_count', 0):,} vectors")
             
-            # Sample existing real protocols to check for duplicates
-            existing_ids = set()
-            if self.namespace in existing_data['namespaces']:
+            # Refresh the ID filter from Pinecone only when the namespace's vector count
+            # no longer matches the count the persisted filter was synced at
+            vector_count = existing_data['namespaces'].get(self.namespace, {}).get('vector_count', 0)
+            cached_count = self._load_id_cache_count()
+            if not vector_count:
+                # Empty (or deleted and recreated) namespace: nothing persisted still applies
+                if not self.existing_ids.is_empty or not self.content_hashes.is_empty or not self.metadata_hashes.is_empty:
+                    logger.info("📋 Real protocols namespace is empty, resetting persisted filters")
+                self._reset_bloom_filters()
+                self._save_bloom_filters()
+                self._save_id_cache(0)
+            elif self.existing_ids.is_empty or cached_count != vector_count:
                 try:
-                    # Query to get existing real protocol IDs
-                    sample_query = self.index.query(
-                        namespace=self.namespace,
-                        vector=[0.1] * existing_data['dimension'],
-                        top_k=10000,  # Get many IDs to check for duplicates
-                        include_metadata=False  # Just need IDs
-                    )
-                    
-                    for match in sample_query.matches:
-                        existing_ids.add(match.id)
-                    
+                    # Rebuild rather than extend, so IDs deleted from the namespace drop out
+                    existing_ids = self._list_existing_ids(existing_data['dimension'])
+                    self.existing_ids = BloomFilter(BLOOM_FILTER_CAPACITY, BLOOM_FILTER_ERROR_RATE)
+                    self.existing_ids.update(existing_ids)
+                    self._save_bloom_filters()
+                    self._save_id_cache(vector_count)
                     logger.info(f"📋 Found {len(existing_ids)} existing real protocol IDs")
                     
                 except Exception as e:
                     logger.warning(f"Could not sample existing IDs: {e}")
+            else:
+                logger.info(f"📋 Loaded existing real protocol IDs from {self._bloom_filter_path('ids')}")
+            self.namespace_vector_count = vector_count
             
-            existing_data['existing_protocol_ids'] = existing_ids
+            existing_data['existing_protocol_ids'] = self.existing_ids
             return existing_data
             
         except Exception as e:
             logger.error(f"❌ Error checking existing data: {e}")
-            return {'total_vectors': 0, 'existing_protocol_ids': set()}
+            return {'total_vectors': 0, 'existing_protocol_ids': self.existing_ids}
+    
+    def _id_cache_path(self) -> Path:
+        """Sidecar file recording the namespace vector count the ID filter matches"""
+        return ID_CACHE_DIR / f"{self.index_name}_{self.namespace}.json"
+    
+    def _load_id_cache_count(self) -> Optional[int]:
+        """Vector count the persisted ID filter was last synced at, if recorded"""
+        try:
+            with open(self._id_cache_path(), 'rb') as f:
+                return json_loads(f.read()).get('vector_count')
+        except (OSError, ValueError):
+            return None
+    
+    def _save_id_cache(self, vector_count: int):
+        """Record the namespace vector count the persisted ID filter now matches"""
+        ID_CACHE_DIR.mkdir(exist_ok=True)
+        with open(self._id_cache_path(), 'wb') as f:
+            f.write(json_dumps({
+                'vector_count': vector_count,
+                'ids_bloom_path': str(self._bloom_filter_path("ids"))
+            }))
+    
+    def _list_existing_ids(self, dimension: int) -> set:
+        """Enumerate every vector ID in the namespace"""
+        try:
+            # Paginated ID listing touches neither the ANN graph nor vector payloads
+            existing_ids = set()
+            for ids_page in self.index.list(namespace=self.namespace, limit=ID_LIST_PAGE_SIZE):
+                existing_ids.update(ids_page)
+            return existing_ids
+        except Exception as e:
+            # Pod-based indexes and older SDKs have no list endpoint
+            logger.warning(f"⚠️ ID listing unavailable ({e}), sampling IDs with a query")
+        
+        sample_query = self.index.query(
+            namespace=self.namespace,
+            vector=[0.1] * dimension,
+            top_k=10000,  # Query results are capped at 10k IDs
+            include_values=False,
+            include_metadata=False
+        )
+        return {match.id for match in sample_query.matches}
     
     async def ingest_real_protocols(self, sample_size: Optional[int] = None):
         """Ingest real protocol data with smart deduplication"""
@@ -119,187 +362,421 @@ class RealProtocolIngestion:
         
         # Check existing data
         existing_data = await self.check_existing_data()
-        existing_ids = existing_data.get('existing_protocol_ids', set())
+        existing_ids = existing_data.get('existing_protocol_ids', self.existing_ids)
         
-        # Load protocol analysis
-        try:
-            with open('real_protocol_analysis.json', 'r') as f:
-                protocol_data = json.load(f)
-            logger.info("✅ Loaded real protocol analysis data")
-        except FileNotFoundError:
+        if not PROTOCOL_ANALYSIS_PATH.exists():
             logger.error("❌ real_protocol_analysis.json not found. Run protocol analysis first.")
             return
         
-        protocols = protocol_data.get('protocols', {})
-        therapeutic_patterns = protocol_data.get('therapeutic_patterns', {})
+        therapeutic_patterns = self._load_therapeutic_patterns()
+        logger.info("✅ Loaded real protocol analysis data")
         
-        # Determine which protocols to ingest
-        protocols_to_ingest = []
-        for protocol_id, protocol_info in protocols.items():
-            # Skip if already exists
-            if protocol_id in existing_ids:
+        # Stream protocols into a bounded queue of batches drained by concurrent workers,
+        # so embedding and upserts start before the analysis file has been fully parsed
+        queue = asyncio.Queue(maxsize=2 * BATCH_CONCURRENCY)
+        self._upsert_limiter = AsyncTokenBucket(
+            rate=UPSERT_VECTORS_PER_SECOND,
+            capacity=2 * self.batch_size,
+            max_rate=UPSERT_MAX_VECTORS_PER_SECOND,
+            speedup_after=UPSERT_SPEEDUP_AFTER
+        )
+        with tqdm(desc="Ingesting batches", unit="batch") as progress:
+            workers = [
+                asyncio.create_task(self._batch_worker(queue, progress))
+                for _ in range(BATCH_CONCURRENCY)
+            ]
+            try:
+                queued = await self._queue_protocol_batches(queue, existing_ids, therapeutic_patterns, sample_size)
+            finally:
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+        
+        self._save_bloom_filters()
+        self.embedding_cache.save()
+        self._save_id_cache(self.namespace_vector_count)
+        
+        logger.info(f"✅ Real protocol ingestion completed!")
+        logger.info(f"   Protocols queued: {queued:,}")
+        logger.info(f"   Successfully ingested: {self.total_ingested:,}")
+        logger.info(f"   Duplicates skipped: {self.duplicate_count:,}")
+        logger.info(f"   Changed protocols re-ingested: {self.changed_count:,}")
+        logger.info(f"   Metadata-only updates: {self.metadata_updated_count:,}")
+        logger.info(f"   Errors: {self.error_count:,}")
+        stage_ms = ", ".join(f"{stage} {ns / 1e6:,.0f} ms" for stage, ns in self.stage_ns.items())
+        logger.info(f"⏱️ Stage wall time (summed across concurrent batches): {stage_ms}")
+    
+    def _load_therapeutic_patterns(self) -> Dict:
+        """Load only the therapeutic_patterns section of the analysis file"""
+        with open(PROTOCOL_ANALYSIS_PATH, 'rb') as f:
+            if not IJSON_AVAILABLE:
+                return json_loads(f.read()).get('therapeutic_patterns', {})
+            for therapeutic_patterns in ijson.items(f, 'therapeutic_patterns', use_float=True):
+                return therapeutic_patterns
+        return {}
+    
+    def _iter_protocols(self):
+        """Yield (protocol_id, protocol_info) pairs without materialising the whole file"""
+        with open(PROTOCOL_ANALYSIS_PATH, 'rb') as f:
+            if not IJSON_AVAILABLE:
+                yield from json_loads(f.read()).get('protocols', {}).items()
+            else:
+                yield from ijson.kvitems(f, 'protocols', use_float=True)
+    
+    async def _queue_protocol_batches(self, queue: asyncio.Queue, existing_ids, therapeutic_patterns: Dict,
+                                      sample_size: Optional[int]) -> int:
+        """Deduplicate and enrich streamed protocols, queueing them in batches"""
+        queued = 0
+        batch_num = 0
+        metadata_changes = 0
+        handlers = {'upsert': self._process_batch, 'metadata': self._update_metadata_batch}
+        pending = {kind: [] for kind in handlers}
+        
+        # Flat per-area lookup tables, built once instead of per protocol
+        success_rate_by_area = {
+            area: pattern.get('success_score', 0.5) for area, pattern in therapeutic_patterns.items()
+        }
+        protocol_count_by_area = {
+            area: len(pattern.get('protocols', ())) for area, pattern in therapeutic_patterns.items()
+        }
+        
+        for protocol_id, protocol_info in self._iter_protocols():
+            # Skip if already ingested during this run
+            if protocol_id in self.run_ids:
                 self.duplicate_count += 1
                 continue
                 
             # Add enriched metadata
             protocol_info['ingestion_timestamp'] = datetime.now().isoformat()
-            protocol_info['data_source'] = 'real_anonymized_protocols'
+            protocol_info['data_source'] = DATA_SOURCE
             protocol_info['namespace'] = self.namespace
             
             # Add therapeutic area success rate
             therapeutic_area = protocol_info.get('therapeutic_area', 'general')
-            if therapeutic_area in therapeutic_patterns:
-                protocol_info['therapeutic_success_rate'] = therapeutic_patterns[therapeutic_area].get('success_score', 0.5)
-                protocol_info['therapeutic_protocol_count'] = len(therapeutic_patterns[therapeutic_area].get('protocols', []))
+            if therapeutic_area in success_rate_by_area:
+                protocol_info['therapeutic_success_rate'] = success_rate_by_area[therapeutic_area]
+                protocol_info['therapeutic_protocol_count'] = protocol_count_by_area[therapeutic_area]
+            
+            started = time.perf_counter_ns()
+            try:
+                text_for_embedding, metadata = self._prepare_protocol(protocol_info)
+            except Exception as e:
+                logger.error(f"❌ Error processing {protocol_id}: {e}")
+                self.error_count += 1
+                continue
+            finally:
+                self.stage_ns['text_build'] += time.perf_counter_ns() - started
+            
+            # Existing protocols are skipped when unchanged, patched in place when only their
+            # metadata changed and re-embedded when their content changed. Before any hashes
+            # were recorded, existing IDs are assumed unchanged and their hashes adopted
+            metadata_key = metadata_hash(metadata)
+            kind = 'upsert'
+            if protocol_id in existing_ids:
+                if metadata['content_hash'] in self.content_hashes or not self.track_content_changes:
+                    self.content_hashes.add(metadata['content_hash'])
+                    if metadata_key in self.metadata_hashes or not self.track_metadata_changes:
+                        self.metadata_hashes.add(metadata_key)
+                        self.duplicate_count += 1
+                        continue
+                    kind = 'metadata'
+                    metadata_changes += 1
+                else:
+                    self.changed_count += 1
+            
+            pending[kind].append((protocol_id, text_for_embedding, metadata, metadata_key))
+            queued += 1
+            if len(pending[kind]) == self.batch_size:
+                batch_num += 1
+                await queue.put((batch_num, pending[kind], handlers[kind]))
+                pending[kind] = []
             
-            protocols_to_ingest.append((protocol_id, protocol_info))
+            # Apply sample size if specified
+            if sample_size and queued >= sample_size:
+                logger.info(f"📊 Limited to {sample_size} protocols for testing")
+                break
         
-        # Apply sample size if specified
-        if sample_size and len(protocols_to_ingest) > sample_size:
-            protocols_to_ingest = protocols_to_ingest[:sample_size]
-            logger.info(f"📊 Limited to {sample_size} protocols for testing")
+        for kind, entries in pending.items():
+            if entries:
+                batch_num += 1
+                await queue.put((batch_num, entries, handlers[kind]))
         
-        logger.info(f"📋 Protocols to ingest: {len(protocols_to_ingest):,}")
+        logger.info(f"📋 Protocols to ingest: {queued:,} in {batch_num} batches")
         logger.info(f"📋 Duplicates skipped: {self.duplicate_count:,}")
-        
-        # Process in batches
-        batches = [protocols_to_ingest[i:i + self.batch_size] 
-                  for i in range(0, len(protocols_to_ingest), self.batch_size)]
-        
-        logger.info(f"🔄 Processing {len(batches)} batches...")
-        
-        for i, batch in enumerate(tqdm(batches, desc="Ingesting batches")):
+        logger.info(f"📋 Changed protocols to re-ingest: {self.changed_count:,}")
+        logger.info(f"📋 Metadata-only changes to patch: {metadata_changes:,}")
+        return queued
+    
+    async def _batch_worker(self, queue: asyncio.Queue, progress):
+        """Process queued batches until a None sentinel arrives"""
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            
+            batch_num, batch, handler = item
             try:
-                await self._process_batch(batch, i + 1, len(batches))
-                
-                # Small delay to avoid rate limits
-                await asyncio.sleep(0.5)
-                
+                await handler(batch, batch_num)
             except Exception as e:
-                logger.error(f"❌ Batch {i + 1} failed: {e}")
+                logger.error(f"❌ Batch {batch_num} failed: {e}")
                 self.error_count += len(batch)
+            progress.update(1)
+    
+    @staticmethod
+    def _prepare_protocol(protocol_info: Dict) -> Tuple[str, Dict]:
+        """Build the embedding text and vector metadata for one enriched protocol"""
+        # Read each field once for both the embedding text and the metadata
+        get = protocol_info.get
+        title = get('title', '')
+        phase = get('phase', '')
+        therapeutic_area = get('therapeutic_area', '')
+        study_type = get('study_type', '')
+        compound_name = get('compound_name', '')
         
-        logger.info(f"✅ Real protocol ingestion completed!")
-        logger.info(f"   Successfully ingested: {self.total_ingested:,}")
-        logger.info(f"   Duplicates skipped: {self.duplicate_count:,}")
-        logger.info(f"   Errors: {self.error_count:,}")
+        # Create text for embedding - combine key fields (only the title can be empty)
+        text_for_embedding = (
+            f"Phase: {phase} | Therapeutic area: {therapeutic_area} | Study type: {study_type}"
+            f" | Compound: {compound_name} | Indication: {get('indication', '')}"
+        )
+        if title:
+            text_for_embedding = f"{title} | {text_for_embedding}"
+        
+        # Add sections if available
+        sections = get('sections')
+        if sections:
+            section_text = " | ".join([section for section in sections[:5] if section])  # First 5 sections
+            if section_text:
+                text_for_embedding = f"{text_for_embedding} | {section_text}"
+        
+        # Comprehensive metadata stored alongside the vector
+        metadata = {
+            # Core protocol info
+            'title': title[:1000],  # Limit length
+            'phase': phase,
+            'therapeutic_area': therapeutic_area,
+            'compound_name': compound_name,
+            'study_type': study_type,
+            'sponsor': get('sponsor', ''),
+            
+            # Success metrics
+            'success_score': float(get('success_score', 0)),
+            'amendment_count': int(get('amendment_count', 0)),
+            'completion_status': get('completion_status', ''),
+            
+            # Therapeutic intelligence
+            'therapeutic_success_rate': float(get('therapeutic_success_rate', 0.5)),
+            'therapeutic_protocol_count': int(get('therapeutic_protocol_count', 0)),
+            
+            # Technical metadata
+            'protocol_length': int(get('total_length', 0)),
+            'data_source': DATA_SOURCE,
+            'ingestion_timestamp': get('ingestion_timestamp', ''),
+            'content_hash': content_hash(text_for_embedding),
+            'text': text_for_embedding[:2000]  # Store text for retrieval
+        }
+        return text_for_embedding, metadata
     
-    async def _process_batch(self, batch: List[tuple], batch_num: int, total_batches: int):
-        """Process a batch of protocols"""
-        vectors = []
+    async def _process_batch(self, batch: List[tuple], batch_num: int):
+        """Embed and upsert a batch of prepared (protocol_id, text, metadata, metadata_hash) entries"""
+        # Get embeddings for the whole batch in one request
+        started = time.perf_counter_ns()
+        batch_embeddings = await self._get_embeddings_batch(
+            [text for _, text, _, _ in batch],
+            [metadata['content_hash'] for _, _, metadata, _ in batch]
+        )
+        self.stage_ns['embed'] += time.perf_counter_ns() - started
         
-        for protocol_id, protocol_info in batch:
-            try:
-                # Create text for embedding - combine key fields
-                text_components = [
-                    protocol_info.get('title', ''),
-                    f"Phase: {protocol_info.get('phase', '')}",
-                    f"Therapeutic area: {protocol_info.get('therapeutic_area', '')}",
-                    f"Study type: {protocol_info.get('study_type', '')}",
-                    f"Compound: {protocol_info.get('compound_name', '')}",
-                    f"Indication: {protocol_info.get('indication', '')}",
-                ]
-                
-                # Add sections if available
-                sections = protocol_info.get('sections', [])
-                if sections:
-                    text_components.extend(sections[:5])  # First 5 sections
-                
-                text_for_embedding = " | ".join([comp for comp in text_components if comp])
-                
-                # Get embeddings
-                embeddings = await self._get_embeddings(text_for_embedding)
-                if not embeddings:
-                    logger.warning(f"⚠️ No embeddings for {protocol_id}")
-                    continue
-                
-                # Create vector with comprehensive metadata
-                vector = {
-                    'id': protocol_id,
-                    'values': embeddings,
-                    'metadata': {
-                        # Core protocol info
-                        'title': protocol_info.get('title', '')[:1000],  # Limit length
-                        'phase': protocol_info.get('phase', ''),
-                        'therapeutic_area': protocol_info.get('therapeutic_area', ''),
-                        'compound_name': protocol_info.get('compound_name', ''),
-                        'study_type': protocol_info.get('study_type', ''),
-                        'sponsor': protocol_info.get('sponsor', ''),
-                        
-                        # Success metrics
-                        'success_score': float(protocol_info.get('success_score', 0)),
-                        'amendment_count': int(protocol_info.get('amendment_count', 0)),
-                        'completion_status': protocol_info.get('completion_status', ''),
-                        
-                        # Therapeutic intelligence
-                        'therapeutic_success_rate': float(protocol_info.get('therapeutic_success_rate', 0.5)),
-                        'therapeutic_protocol_count': int(protocol_info.get('therapeutic_protocol_count', 0)),
-                        
-                        # Technical metadata
-                        'protocol_length': int(protocol_info.get('total_length', 0)),
-                        'data_source': 'real_anonymized_protocols',
-                        'ingestion_timestamp': protocol_info.get('ingestion_timestamp', ''),
-                        'text': text_for_embedding[:2000]  # Store text for retrieval
-                    }
-                }
-                
-                vectors.append(vector)
-                
-            except Exception as e:
-                logger.error(f"❌ Error processing {protocol_id}: {e}")
-                self.error_count += 1
+        # Columnar batch: IDs, one float32 value matrix and metadata, sent as
+        # (id, values, metadata) tuples so the SDK skips per-vector dict handling
+        embedded = []
+        for (protocol_id, _, metadata, metadata_key), embeddings in zip(batch, batch_embeddings):
+            if embeddings is None:
+                logger.warning(f"⚠️ No embeddings for {protocol_id}")
+                continue
+            embedded.append((protocol_id, embeddings, metadata, metadata_key))
+        if not embedded:
+            return
+        
+        ids, rows, metadatas, metadata_keys = zip(*embedded)
+        values = np.stack(rows).tolist()  # One C-level conversion for the whole batch
+        vectors = list(zip(ids, values, metadatas))
         
         # Upsert batch to Pinecone
-        if vectors:
+        started = time.perf_counter_ns()
+        try:
+            await self._upsert_with_retry(vectors)
+            self.stage_ns['upsert'] += time.perf_counter_ns() - started
+            self.total_ingested += len(vectors)
+            for protocol_id, metadata, metadata_key in zip(ids, metadatas, metadata_keys):
+                if protocol_id not in self.existing_ids:
+                    self.namespace_vector_count += 1
+                self.existing_ids.add(protocol_id)
+                self.run_ids.add(protocol_id)
+                self.content_hashes.add(metadata['content_hash'])
+                self.metadata_hashes.add(metadata_key)
+            logger.info(f"✅ Batch {batch_num}: {len(vectors)} vectors ingested")
+            
+        except Exception as e:
+            logger.error(f"❌ Pinecone upsert failed for batch {batch_num}: {e}")
+            self.error_count += len(vectors)
+    
+    async def _update_metadata_batch(self, batch: List[tuple], batch_num: int):
+        """Patch metadata in place for protocols whose embedding text is unchanged"""
+        await self._upsert_limiter.acquire(len(batch))
+        started = time.perf_counter_ns()
+        results = await asyncio.gather(*(
+            asyncio.to_thread(self.index.update, id=protocol_id, set_metadata=metadata, namespace=self.namespace)
+            for protocol_id, _, metadata, _ in batch
+        ), return_exceptions=True)
+        self.stage_ns['metadata_update'] += time.perf_counter_ns() - started
+        
+        updated = 0
+        for (protocol_id, _, _, metadata_key), result in zip(batch, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Metadata update failed for {protocol_id}: {result}")
+                self.error_count += 1
+                continue
+            self.metadata_hashes.add(metadata_key)
+            self.run_ids.add(protocol_id)
+            updated += 1
+        
+        self.metadata_updated_count += updated
+        logger.info(f"✅ Batch {batch_num}: {updated} metadata updates")
+    
+    async def _upsert_with_retry(self, vectors: List[Tuple[str, List[float], Dict]]):
+        """Upsert off the event loop, backing off exponentially when rate limited"""
+        for attempt in range(UPSERT_MAX_RETRIES):
+            await self._upsert_limiter.acquire(len(vectors))
             try:
-                self.index.upsert(
-                    vectors=vectors,
-                    namespace=self.namespace
-                )
-                self.total_ingested += len(vectors)
-                logger.info(f"✅ Batch {batch_num}/{total_batches}: {len(vectors)} vectors ingested")
-                
+                result = await asyncio.to_thread(self.index.upsert, vectors=vectors, namespace=self.namespace)
+                self._upsert_limiter.record_success()
+                return result
             except Exception as e:
-                logger.error(f"❌ Pinecone upsert failed for batch {batch_num}: {e}")
-                self.error_count += len(vectors)
+                if not _is_rate_limited(e):
+                    raise
+                self._upsert_limiter.record_throttle()
+                if attempt == UPSERT_MAX_RETRIES - 1:
+                    raise
+                delay = min(UPSERT_MAX_BACKOFF, 2 ** attempt) * (0.5 + random.random())
+                logger.warning(f"⚠️ Pinecone rate limited, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
     
-    async def _get_embeddings(self, text: str) -> Optional[List[float]]:
+    async def _get_embeddings(self, text: str) -> Optional[np.ndarray]:
         """Get embeddings using ML service or fallback"""
-        try:
-            if self.ml_client:
-                # Use PubMedBERT via ML service
-                embeddings = await self.ml_client.get_pubmedbert_embeddings(text)
-                if embeddings and len(embeddings) == 768:
-                    return embeddings
+        return (await self._get_embeddings_batch([text]))[0]
+    
+    async def _get_embeddings_batch(self, texts: List[str], keys: Optional[List[str]] = None) -> List[Optional[np.ndarray]]:
+        """Get embeddings for several texts, one endpoint request for all fallback texts"""
+        # Serve previously embedded texts from the local cache, keyed by source and content hash
+        if keys is None:
+            keys = [content_hash(text) for text in texts]
+        source = self._embedding_source(via_ml_service=self.ml_client is not None)
+        embeddings = [self.embedding_cache.get(f"{source}:{key}") for key in keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            cacheable = await self._fetch_embeddings(texts, embeddings, missing)
+            for i, source in cacheable.items():
+                self.embedding_cache.put(f"{source}:{keys[i]}", embeddings[i])
+        return embeddings
+    
+    @staticmethod
+    def _embedding_source(via_ml_service: bool) -> str:
+        """Embedding cache namespace: the client used and the model endpoint behind it"""
+        client = "ml_service" if via_ml_service else "endpoint"
+        return f"{client}@{os.getenv('PUBMEDBERT_ENDPOINT_URL', '')}"
+    
+    async def _fetch_embeddings(self, texts: List[str], embeddings: List[Optional[np.ndarray]],
+                                missing: List[int]) -> Dict[int, str]:
+        """Fill embeddings[i] for each missing index from the ML service or the endpoint
+        
+        Returns the source of each vector embedded from its full, untruncated text;
+        only those are safe to cache under the text's content hash.
+        """
+        cacheable = {}
+        if self.ml_client:
+            # Use PubMedBERT via ML service, a bounded number of calls at a time
+            semaphore = asyncio.Semaphore(ML_EMBEDDING_CONCURRENCY)
+            
+            async def ml_embedding(text: str) -> Optional[np.ndarray]:
+                async with semaphore:
+                    try:
+                        result = await self.ml_client.get_pubmedbert_embeddings(text)
+                    except Exception as e:
+                        logger.error(f"❌ ML service embedding failed: {e}")
+                        return None
+                return as_embedding(result)
+            
+            results = await asyncio.gather(*(ml_embedding(texts[i]) for i in missing))
+            source = self._embedding_source(via_ml_service=True)
+            for i, embedding in zip(missing, results):
+                embeddings[i] = embedding
+                if embedding is not None and len(texts[i]) <= ML_SERVICE_MAX_INPUT_CHARS:
+                    cacheable[i] = source
             
-            # Fallback to direct API call
-            import requests
+            missing = [i for i in missing if embeddings[i] is None]
+            if not missing:
+                return cacheable
+        
+        try:
+            # Fallback to direct API call with every remaining text in one request
             headers = {"Authorization": f"Bearer {os.getenv('HUGGINGFACE_API_KEY')}"}
-            response = requests.post(
+            async with self._get_http_session().post(
                 os.getenv('PUBMEDBERT_ENDPOINT_URL'),
                 headers=headers,
-                json={"inputs": text[:512]},  # Single text input
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                # Handle {"embeddings": [vector]} format
-                if isinstance(result, dict) and "embeddings" in result:
-                    embeddings = result["embeddings"]
-                    if isinstance(embeddings, list) and len(embeddings) == 768:
-                        return embeddings
-                # Handle legacy list format
-                elif isinstance(result, list) and len(result) > 0:
-                    if isinstance(result[0], list) and len(result[0]) == 768:
-                        return result[0]
+                json={"inputs": [texts[i][:ENDPOINT_MAX_INPUT_CHARS] for i in missing]}
+            ) as response:
+                if response.status == 200:
+                    vectors = self._parse_embedding_batch(json_loads(await response.read()), len(missing))
+                    if vectors is not None:
+                        source = self._embedding_source(via_ml_service=False)
+                        for i, vector in zip(missing, vectors):
+                            embeddings[i] = vector
+                            if vector is not None and len(texts[i]) <= ENDPOINT_MAX_INPUT_CHARS:
+                                cacheable[i] = source
+                        return cacheable
             
             logger.warning(f"⚠️ Embedding API returned unexpected format")
-            return None
             
         except Exception as e:
             logger.error(f"❌ Embedding generation failed: {e}")
+        return cacheable
+    
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Shared connection-pooled session so requests reuse TCP/TLS connections"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=EMBEDDING_HTTP_CONNECTIONS, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=EMBEDDING_HTTP_TIMEOUT)
+            )
+        return self._http
+    
+    async def shutdown(self):
+        """Close the embedding HTTP session"""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+    
+    @staticmethod
+    def _parse_embedding_batch(result: Any, count: int) -> Optional[List[Optional[np.ndarray]]]:
+        """Per-input float32 vectors from a batched embedding response, or None if unrecognised"""
+        # Handle {"embeddings": [vector, ...]} format
+        if isinstance(result, dict):
+            result = result.get("embeddings")
+        
+        try:
+            matrix = np.asarray(result, dtype=np.float32)
+        except (TypeError, ValueError):
+            # Ragged response: validate each vector on its own
+            if not isinstance(result, list) or len(result) != count:
+                return None
+            return [as_embedding(vector) for vector in result]
+        
+        # A single input may come back as a bare vector
+        if count == 1 and matrix.shape == (EMBEDDING_DIMENSION,):
+            matrix = matrix[np.newaxis]
+        if matrix.shape != (count, EMBEDDING_DIMENSION):
             return None
+        return list(matrix)
     
     async def verify_ingestion(self):
         """Verify the ingested data"""
@@ -337,34 +814,55 @@ class RealProtocolIngestion:
 
 async def main():
     """Main ingestion function"""
-    import sys
-    
     ingestion = RealProtocolIngestion()
     
-    # Parse command line arguments
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--full":
-            logger.info("🚀 Running full ingestion of 16,730 protocols...")
-            await ingestion.ingest_real_protocols(sample_size=None)  # All protocols
-        elif sys.argv[1] == "--sample":
-            logger.info("🧪 Running sample ingestion (100 protocols)...")
-            await ingestion.ingest_real_protocols(sample_size=100)
-        elif sys.argv[1] == "--verify":
-            logger.info("🔍 Verifying existing ingestion...")
-            await ingestion.verify_ingestion()
-            return
+    try:
+        # Parse command line arguments
+        if len(sys.argv) > 1:
+            if sys.argv[1] == "--full":
+                logger.info("🚀 Running full ingestion of 16,730 protocols...")
+                await ingestion.ingest_real_protocols(sample_size=None)  # All protocols
+            elif sys.argv[1] == "--sample":
+                logger.info("🧪 Running sample ingestion (100 protocols)...")
+                await ingestion.ingest_real_protocols(sample_size=100)
+            elif sys.argv[1] == "--verify":
+                logger.info("🔍 Verifying existing ingestion...")
+                await ingestion.verify_ingestion()
+                return
+            elif sys.argv[1] == "--profile":
+                logger.info("⏱️ Profiling sample ingestion (200 protocols)...")
+                profiler = cProfile.Profile()
+                profiler.enable()
+                try:
+                    await ingestion.ingest_real_protocols(sample_size=200)
+                finally:
+                    profiler.disable()
+                    profiler.dump_stats(PROFILE_OUTPUT_PATH)
+                pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+                logger.info(f"⏱️ Profile written to {PROFILE_OUTPUT_PATH}; for a flamegraph run "
+                            f"py-spy record -o flame.svg -- python3 real_protocol_ingestion.py --sample")
+                return
+            else:
+                print("Usage: python3 real_protocol_ingestion.py [--full|--sample|--verify|--profile]")
+                return
         else:
-            print("Usage: python3 real_protocol_ingestion.py [--full|--sample|--verify]")
-            return
-    else:
-        # Default: sample ingestion
-        logger.info("🧪 Running default sample ingestion (100 protocols)...")
-        await ingestion.ingest_real_protocols(sample_size=100)
-    
-    # Verify results
-    await ingestion.verify_ingestion()
-    
-    logger.info("🎉 Real protocol ingestion pipeline completed!")
+            # Default: sample ingestion
+            logger.info("🧪 Running default sample ingestion (100 protocols)...")
+            await ingestion.ingest_real_protocols(sample_size=100)
+        
+        # Verify results
+        await ingestion.verify_ingestion()
+        
+        logger.info("🎉 Real protocol ingestion pipeline completed!")
+    finally:
+        await ingestion.shutdown()
 
 if __name__ == "__main__":
+    # libuv-backed event loop where available (uvloop ships with uvicorn[standard])
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
     asyncio.run(main())
\ No newline at end of file
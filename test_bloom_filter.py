@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test the persisted Bloom filter that decides which protocols ingestion skips
+"""
+
+import tempfile
+from pathlib import Path
+from bloom_filter import BloomFilter
+
+def test_no_false_negatives():
+    print("🧪 Testing membership after add/update...")
+    bloom = BloomFilter(capacity=1000, error_rate=1e-3)
+    ids = [f"real_protocol_{i}" for i in range(1000)]
+    
+    bloom.add(ids[0])
+    bloom.update(ids[1:])
+    
+    missing = [protocol_id for protocol_id in ids if protocol_id not in bloom]
+    assert not missing, missing[:5]
+    print("✅ PASS: Every added ID is reported present")
+    
+    false_positives = sum(f"unseen_protocol_{i}" in bloom for i in range(10_000))
+    print(f"False positives: {false_positives}/10000 at error_rate 1e-3")
+    assert false_positives < 50
+
+def test_is_empty():
+    print("🧪 Testing is_empty...")
+    bloom = BloomFilter(capacity=100, error_rate=1e-3)
+    assert bloom.is_empty
+    assert "real_protocol_1" not in bloom
+    
+    bloom.add("real_protocol_1")
+    assert not bloom.is_empty
+    print("✅ PASS: is_empty flips once a key is added")
+
+def test_save_load_round_trip():
+    print("🧪 Testing save/load round trip...")
+    bloom = BloomFilter(capacity=500, error_rate=1e-4)
+    ids = [f"real_protocol_{i}" for i in range(500)]
+    bloom.update(ids)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "ids.bin"
+        bloom.save(path)
+        loaded = BloomFilter.load(path, capacity=500, error_rate=1e-4)
+    
+    assert not loaded.is_empty
+    assert all(protocol_id in loaded for protocol_id in ids)
+    assert (loaded._bits == bloom._bits).all()
+    print("✅ PASS: Loaded filter matches the saved one bit for bit")
+
+def test_load_missing_or_mismatched():
+    print("🧪 Testing load without a matching saved filter...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "ids.bin"
+        assert BloomFilter.load(path, capacity=500, error_rate=1e-4).is_empty
+    
+        bloom = BloomFilter(capacity=500, error_rate=1e-4)
+        bloom.add("real_protocol_1")
+        bloom.save(path)
+    
+        # A filter saved with other parameters has a different bit array size
+        loaded = BloomFilter.load(path, capacity=5000, error_rate=1e-4)
+        assert loaded.is_empty
+        assert loaded.capacity == 5000
+    print("✅ PASS: Missing or mismatched files load as an empty filter")
+
+def test_invalid_parameters():
+    for capacity, error_rate in ((0, 1e-3), (100, 0), (100, 1)):
+        try:
+            BloomFilter(capacity, error_rate)
+        except ValueError:
+            continue
+        raise AssertionError(f"BloomFilter({capacity}, {error_rate}) should raise")
+    print("✅ PASS: Invalid capacity and error rates rejected")
+
+if __name__ == "__main__":
+    test_no_false_negatives()
+    test_is_empty()
+    test_save_load_round_trip()
+    test_load_missing_or_mismatched()
+    test_invalid_parameters()
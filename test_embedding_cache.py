@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test the float16 embedding cache used to skip re-embedding unchanged protocols
+"""
+
+import tempfile
+from pathlib import Path
+import numpy as np
+from embedding_cache import EmbeddingCache
+
+DIMENSION = 8
+
+def random_vectors(count, seed=0):
+    return np.random.default_rng(seed).standard_normal((count, DIMENSION)).astype(np.float32)
+
+def test_put_get():
+    print("🧪 Testing put/get...")
+    with tempfile.TemporaryDirectory() as directory:
+        cache = EmbeddingCache(directory, DIMENSION, initial_rows=4)
+        vector = random_vectors(1)[0]
+    
+        assert cache.get("protocol_1") is None
+        cache.put("protocol_1", vector)
+        cached = cache.get("protocol_1")
+    
+        assert cached.dtype == np.float32
+        assert np.allclose(cached, vector, rtol=1e-3, atol=1e-3)
+        assert "protocol_1" in cache and len(cache) == 1
+    
+        # Existing keys are left untouched
+        cache.put("protocol_1", np.zeros(DIMENSION, dtype=np.float32))
+        assert np.array_equal(cache.get("protocol_1"), cached)
+    print("✅ PASS: Vectors come back as float32 within float16 tolerance")
+
+def test_growth_past_initial_rows():
+    print("🧪 Testing growth past initial_rows...")
+    with tempfile.TemporaryDirectory() as directory:
+        cache = EmbeddingCache(directory, DIMENSION, initial_rows=4)
+        vectors = random_vectors(9)
+    
+        capacities = []
+        for i, vector in enumerate(vectors):
+            cache.put(f"protocol_{i}", vector)
+            capacities.append(cache._vectors.shape[0])
+        print(f"Capacity after each put: {capacities}")
+        assert capacities == [4, 4, 4, 4, 8, 8, 8, 8, 16]
+    
+        vectors_path = Path(directory) / EmbeddingCache.VECTORS_FILE
+        assert vectors_path.stat().st_size == 16 * DIMENSION * 2
+        for i, vector in enumerate(vectors):
+            assert np.allclose(cache.get(f"protocol_{i}"), vector, rtol=1e-3, atol=1e-3)
+    print("✅ PASS: Backing file doubles and earlier rows survive each remap")
+
+def test_reopen_after_save():
+    print("🧪 Testing reopen after save...")
+    with tempfile.TemporaryDirectory() as directory:
+        cache = EmbeddingCache(directory, DIMENSION, initial_rows=4)
+        vectors = random_vectors(6)
+        for i, vector in enumerate(vectors):
+            cache.put(f"protocol_{i}", vector)
+        cache.save()
+    
+        reopened = EmbeddingCache(directory, DIMENSION, initial_rows=4)
+        assert len(reopened) == 6
+        for i in range(6):
+            assert np.array_equal(reopened.get(f"protocol_{i}"), cache.get(f"protocol_{i}"))
+    
+        # Appending after a reopen continues after the existing rows
+        reopened.put("protocol_6", vectors[0])
+        assert np.array_equal(reopened.get("protocol_5"), cache.get("protocol_5"))
+    print("✅ PASS: Saved keys and vectors reload")
+
+def test_reopen_with_truncated_vectors():
+    print("🧪 Testing reopen with a truncated vectors file...")
+    with tempfile.TemporaryDirectory() as directory:
+        cache = EmbeddingCache(directory, DIMENSION, initial_rows=4)
+        for i, vector in enumerate(random_vectors(3)):
+            cache.put(f"protocol_{i}", vector)
+        cache.save()
+    
+        # Leave room for only two of the three indexed rows
+        vectors_path = Path(directory) / EmbeddingCache.VECTORS_FILE
+        with open(vectors_path, "r+b") as f:
+            f.truncate(2 * DIMENSION * 2)
+    
+        reopened = EmbeddingCache(directory, DIMENSION, initial_rows=4)
+        assert len(reopened) == 0
+        assert reopened.get("protocol_0") is None
+    print("✅ PASS: Index dropped when the vectors file cannot hold it")
+
+if __name__ == "__main__":
+    test_put_get()
+    test_growth_past_initial_rows()
+    test_reopen_after_save()
+    test_reopen_with_truncated_vectors()
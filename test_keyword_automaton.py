@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test the shared keyword automaton against plain substring search
+"""
+
+import random
+from keyword_automaton import KeywordAutomaton
+
+def build_automaton(keywords, ignore_case=False):
+    """Automaton whose payload for each keyword is the keyword itself"""
+    automaton = KeywordAutomaton(ignore_case=ignore_case)
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+def find_all(text, keywords):
+    """Every (end_index, keyword) occurrence, found one str.find at a time"""
+    hits = []
+    for keyword in keywords:
+        start = text.find(keyword)
+        while start != -1:
+            hits.append((start + len(keyword) - 1, keyword))
+            start = text.find(keyword, start + 1)
+    return sorted(hits)
+
+def test_overlapping_hits():
+    print("🧪 Testing overlapping keyword hits...")
+    automaton = build_automaton(["phase i", "phase ii", "phase iii"])
+    
+    hits = list(automaton.iter("this phase iii study"))
+    print(f"Hits: {hits}")
+    assert hits == [(11, "phase i"), (12, "phase ii"), (13, "phase iii")]
+    print("✅ PASS: 'phase i' and 'phase ii' reported inside 'phase iii'")
+
+def test_ignore_case():
+    print("🧪 Testing case-insensitive matching...")
+    automaton = build_automaton(["Twice Daily", "FDA"], ignore_case=True)
+    
+    text = "Dosed TWICE daily per fda guidance"
+    hits = list(automaton.iter(text))
+    print(f"Hits: {hits}")
+    assert hits == [(16, "Twice Daily"), (24, "FDA")]
+    
+    # Positions index the original text, not a lowercased copy
+    assert text[6:17] == "TWICE daily"
+    assert text[22:25] == "fda"
+    print("✅ PASS: Case-insensitive hits located on the original text")
+
+def test_iter_longest():
+    print("🧪 Testing leftmost-longest matching...")
+    automaton = build_automaton(["daily", "twice daily"])
+    
+    text = "twice daily, then daily"
+    print(f"iter: {list(automaton.iter(text))}")
+    assert list(automaton.iter(text)) == [(10, "twice daily"), (10, "daily"), (22, "daily")]
+    
+    longest = list(automaton.iter_longest(text))
+    print(f"iter_longest: {longest}")
+    assert longest == [(10, "twice daily"), (22, "daily")]
+    print("✅ PASS: 'daily' not reported inside 'twice daily'")
+
+def test_duplicate_keywords():
+    print("🧪 Testing keywords added more than once...")
+    automaton = KeywordAutomaton()
+    automaton.add_word("placebo", "first")
+    automaton.add_word("placebo", "second")
+    automaton.make_automaton()
+    
+    assert list(automaton.iter("placebo")) == [(6, "first"), (6, "second")]
+    print("✅ PASS: Every payload reported")
+
+def test_matches_substring_search():
+    print("🧪 Testing against str.find on random text...")
+    rng = random.Random(0)
+    for _ in range(500):
+        keywords = list({"".join(rng.choice("ab ") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 6))})
+        text = "".join(rng.choice("ab ") for _ in range(rng.randint(0, 40)))
+    
+        hits = sorted(build_automaton(keywords).iter(text))
+        assert hits == find_all(text, keywords), (keywords, text)
+    print("✅ PASS: 500 random cases agree with str.find")
+
+def test_requires_make_automaton():
+    automaton = KeywordAutomaton()
+    automaton.add_word("dose", "dose")
+    try:
+        list(automaton.iter("dose"))
+    except RuntimeError:
+        print("✅ PASS: iter() before make_automaton() raises")
+    else:
+        raise AssertionError("iter() should require make_automaton()")
+
+if __name__ == "__main__":
+    test_overlapping_hits()
+    test_ignore_case()
+    test_iter_longest()
+    test_duplicate_keywords()
+    test_matches_substring_search()
+    test_requires_make_automaton()
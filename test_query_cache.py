@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test the LRU + TTL cache that holds Pinecone query results across requests
+"""
+
+from unittest import mock
+from query_cache import QueryCache
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when told to"""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+def test_ttl_expiry():
+    print("🧪 Testing TTL expiry...")
+    clock = FakeClock()
+    with mock.patch("query_cache.time.monotonic", clock):
+        cache = QueryCache(max_size=10, ttl_seconds=60)
+        cache.put("query", ["match"])
+    
+        clock.now += 59
+        assert cache.get("query") == ["match"]
+    
+        clock.now += 1
+        assert cache.get("query") is None
+    print("✅ PASS: Entries expire ttl_seconds after being stored")
+
+def test_expired_get_deletes_and_counts_miss():
+    print("🧪 Testing get on an expired entry...")
+    clock = FakeClock()
+    with mock.patch("query_cache.time.monotonic", clock):
+        cache = QueryCache(max_size=10, ttl_seconds=60)
+        cache.put("query", ["match"])
+        assert cache.get("query") == ["match"]
+        assert (cache.hits, cache.misses) == (1, 0)
+    
+        clock.now += 61
+        assert cache.get("query") is None
+        assert len(cache) == 0
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.hit_rate == 0.5
+    print("✅ PASS: Expired entry deleted and counted as a miss")
+
+def test_lru_eviction():
+    print("🧪 Testing LRU eviction...")
+    cache = QueryCache(max_size=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.evictions == 1
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    
+    cache.put("d", 4)
+    assert cache.evictions == 2
+    assert cache.get("a") is None
+    print("✅ PASS: Least recently used entries evicted and counted")
+
+def test_invalid_parameters():
+    for max_size, ttl_seconds in ((0, 60), (10, 0)):
+        try:
+            QueryCache(max_size, ttl_seconds)
+        except ValueError:
+            continue
+        raise AssertionError(f"QueryCache({max_size}, {ttl_seconds}) should raise")
+    print("✅ PASS: Non-positive size and TTL rejected")
+
+if __name__ == "__main__":
+    test_ttl_expiry()
+    test_expired_get_deletes_and_counts_miss()
+    test_lru_eviction()
+    test_invalid_parameters()